@@ -23,9 +23,15 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 import argparse
+import hashlib
+import io
 import logging
+import os
+import pickle
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional, TextIO
 
 try:
     import yaml
@@ -33,6 +39,11 @@ except ImportError:
     print("Error: PyYAML is required. Install with: pip install pyyaml", file=sys.stderr)
     sys.exit(1)
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 __version__ = "1.0.0"
 
 PROJECT_ROOT = Path(__file__).resolve().parent
@@ -44,41 +55,182 @@ OUTPUT_FILE = RESOURCES_DIR / "resume_sections.tex"
 # Max characters per skill items line so PDF stays one line (Awesome-CV ~70% text width).
 SKILL_ITEMS_MAX_CHARS = 58
 
+# Strings longer than this go through the Numba kernel when Numba is installed; shorter ones
+# are cheaper through str.translate than the encode/decode round-trip.
+NUMBA_ESCAPE_MIN_CHARS = 256
+
+
+# Single-character LaTeX escapes; str.translate applies them in one pass, so the
+# backslashes in replacement text are never re-escaped.
+_LATEX_ESCAPES = str.maketrans({
+    "\\": r"\textbackslash ",
+    "&": r"\&",
+    "%": r"\%",
+    "#": r"\#",
+    "_": r"\_",
+    "{": r"\{",
+    "}": r"\}",
+    "$": r"\$",
+    "~": r"\textasciitilde ",
+    "^": r"\textasciicircum ",
+})
+_LATEX_SPECIALS = frozenset(map(chr, _LATEX_ESCAPES))
+
+
+@lru_cache(maxsize=4096)
+def _escape_latex_str(text: str) -> str:
+    """Memoized escape; categories, organizations, dates and locations repeat across entries."""
+    return text.translate(_LATEX_ESCAPES)
+
 
 def escape_latex(text: str) -> str:
     """Escape LaTeX special characters in plain text."""
     if not text:
         return ""
-    replacements = [
-        ("\\", r"\textbackslash "),
-        ("&", r"\&"),
-        ("%", r"\%"),
-        ("#", r"\#"),
-        ("_", r"\_"),
-        ("{", r"\{"),
-        ("}", r"\}"),
-        ("$", r"\$"),
-        ("~", r"\textasciitilde "),
-        ("^", r"\textasciicircum "),
-    ]
-    result = str(text)
-    for old, new in replacements:
-        result = result.replace(old, new)
-    return result
-
-
-def render_summary(summary: str) -> str:
-    """Render the Summary section."""
-    escaped = escape_latex(summary.strip())
-    return f"""%--------------------------------------------------
-% Summary
-%--------------------------------------------------
-\\cvsection{{Summary}}
-
-\\begin{{cvparagraph}}
-{escaped}
-\\end{{cvparagraph}}
-"""
+    s = str(text)
+    # Most bullets and summaries contain no specials; skip the translate and cache entirely.
+    if _LATEX_SPECIALS.isdisjoint(s):
+        return s
+    if len(s) > NUMBA_ESCAPE_MIN_CHARS:
+        kernel = _numba_escape_kernel()
+        if kernel is not None:
+            return kernel(s)
+    return _escape_latex_str(s)
+
+
+@lru_cache(maxsize=None)
+def _numba_escape_kernel():
+    """Build the optional Numba escape path. Returns a str -> str function, or None without Numba.
+
+    Imported lazily so plain runs don't pay Numba's import cost. Works on UTF-8 bytes: every
+    special is ASCII and multi-byte sequences never contain ASCII bytes, so a byte table is exact.
+    """
+    try:
+        import numpy as np
+        from numba import njit
+    except ImportError:
+        return None
+
+    rep_start = np.zeros(256, dtype=np.int64)
+    rep_len = np.zeros(256, dtype=np.int64)
+    chunks = []
+    offset = 0
+    for code, replacement in _LATEX_ESCAPES.items():
+        encoded = replacement.encode("ascii")
+        rep_start[code] = offset
+        rep_len[code] = len(encoded)
+        chunks.append(encoded)
+        offset += len(encoded)
+    rep_bytes = np.frombuffer(b"".join(chunks), dtype=np.uint8)
+    max_len = int(rep_len.max())
+
+    @njit(cache=True)
+    def _escape_bytes(buf, out, rep_start, rep_len, rep_bytes):
+        n = 0
+        for i in range(buf.shape[0]):
+            c = buf[i]
+            length = rep_len[c]
+            if length == 0:
+                out[n] = c
+                n += 1
+            else:
+                start = rep_start[c]
+                for k in range(length):
+                    out[n + k] = rep_bytes[start + k]
+                n += length
+        return n
+
+    def escape_latex_fast(text: str) -> str:
+        buf = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+        out = np.empty(buf.shape[0] * max_len, dtype=np.uint8)
+        n = _escape_bytes(buf, out, rep_start, rep_len, rep_bytes)
+        return out[:n].tobytes().decode("utf-8")
+
+    return escape_latex_fast
+
+
+# Section templates, filled with %-formatting from pre-escaped text.
+_SUMMARY_TPL = (
+    "%%--------------------------------------------------\n"
+    "%% Summary\n"
+    "%%--------------------------------------------------\n"
+    "\\cvsection{Summary}\n"
+    "\n"
+    "\\begin{cvparagraph}\n"
+    "%s\n"
+    "\\end{cvparagraph}\n"
+)
+_SKILLS_HEADER = (
+    "%--------------------------------------------------\n"
+    "% Skills (condensed, Awesome-CV style)\n"
+    "%--------------------------------------------------\n"
+    "\\cvsection{Skills}\n"
+    "\n"
+    "\\begin{cvskills}\n"
+)
+_SKILL_TPL = "\\cvskill{%s}{%s}\n"
+_EXPERIENCE_HEADER = (
+    "%--------------------------------------------------\n"
+    "% Experience\n"
+    "%--------------------------------------------------\n"
+    "\\cvsection{Experience}\n"
+)
+_PROJECTS_HEADER = (
+    "%--------------------------------------------------\n"
+    "% Projects\n"
+    "%--------------------------------------------------\n"
+    "\\cvsection{Projects}\n"
+)
+# cventry: position, title, location, date, description
+_ENTRY_TPL = "\\cventry\n{%s}\n{%s}\n{%s}\n{%s}\n{\n%s\n}\n"
+
+
+def _escape_entry(entry: dict) -> dict:
+    """Escape the text fields of one experience/project entry; position is kept as-is when raw_position is set."""
+    escaped = dict(entry)
+    keys = ("organization", "date", "location")
+    if not entry.get("raw_position", False):
+        keys += ("position", "name")
+    for key in keys:
+        if key in entry:
+            escaped[key] = escape_latex(entry[key])
+    bullets = entry.get("bullets")
+    if isinstance(bullets, (list, tuple)):
+        escaped["bullets"] = [escape_latex(b) for b in bullets]
+    description = entry.get("description")
+    if isinstance(description, str):
+        escaped["description"] = escape_latex(description)
+    elif isinstance(description, (list, tuple)):
+        escaped["description"] = [escape_latex(d) for d in description]
+    return escaped
+
+
+def _escape_data(data: dict) -> dict:
+    """Return a copy of the parsed content with every rendered text field LaTeX-escaped once.
+
+    Skill items are left raw so render_skills can truncate before escaping.
+    """
+    escaped = dict(data)
+    if "summary" in data:
+        # Strip before escaping: a trailing "~" or "^" escapes to a command whose trailing space must survive.
+        escaped["summary"] = escape_latex((data["summary"] or "").strip())
+    if "skills" in data:
+        escaped["skills"] = [
+            {**skill, "category": escape_latex(skill["category"])} for skill in data["skills"]
+        ]
+    for section in ("experience", "projects"):
+        if section in data:
+            escaped[section] = [_escape_entry(entry) for entry in data[section]]
+    return escaped
+
+
+def render_summary(summary: str, *, buf: Optional[TextIO] = None) -> Optional[str]:
+    """Render the Summary section from stripped, pre-escaped text. Writes to buf if given, else returns the text."""
+    section = _SUMMARY_TPL % summary
+    if buf is None:
+        return section
+    buf.write(section)
+    return None
 
 
 def _truncate_skill_items(items_str: str, max_chars: int) -> str:
@@ -92,19 +244,17 @@ def _truncate_skill_items(items_str: str, max_chars: int) -> str:
     return items_str[:max_chars].strip()
 
 
-def render_skills(skills: list[dict]) -> str:
-    """Render the Skills section. One row per category; items truncated to fit one line."""
-    lines = [
-        "%--------------------------------------------------",
-        "% Skills (condensed, Awesome-CV style)",
-        "%--------------------------------------------------",
-        "\\cvsection{Skills}",
-        "",
-        "\\begin{cvskills}",
-    ]
+def render_skills(skills: list[dict], *, buf: Optional[TextIO] = None) -> Optional[str]:
+    """Render the Skills section. One row per category; items truncated to fit one line.
+
+    Writes to buf if given, else returns the text.
+    """
+    out = io.StringIO() if buf is None else buf
+    out.write(_SKILLS_HEADER)
     for skill in skills:
-        category = escape_latex(skill["category"])
+        category = skill["category"]
         raw_items = skill.get("items", "")
+        # Items stay raw in _escape_data: truncation must count visible characters, not escapes.
         # Schema expects items as string; LLM may output a list — normalize to one string.
         if isinstance(raw_items, (list, tuple)):
             items_str = ", ".join(str(x).strip() for x in raw_items)
@@ -113,9 +263,9 @@ def render_skills(skills: list[dict]) -> str:
         items_str = _truncate_skill_items(items_str, SKILL_ITEMS_MAX_CHARS)
         items = escape_latex(items_str)
         items = items.replace(", ", ", \\allowbreak ")
-        lines.append(f"\\cvskill{{{category}}}{{{items}}}")
-    lines.extend(["\\end{cvskills}", ""])
-    return "\n".join(lines)
+        out.write(_SKILL_TPL % (category, items))
+    out.write("\\end{cvskills}\n")
+    return out.getvalue() if buf is None else None
 
 
 def render_entry(
@@ -125,60 +275,41 @@ def render_entry(
     location: str,
     bullets: list[str],
     *,
-    raw_position: bool = False,
-) -> str:
-    """Render a single cventry (experience or project)."""
-    pos_text = position if raw_position else escape_latex(position)
-    org_text = escape_latex(organization)
-    date_text = escape_latex(date)
-    loc_text = escape_latex(location)
-
-    # cventry: position, title, location, date, description
-    bullet_lines = [f"\\item {escape_latex(b)}" for b in bullets]
-    items_block = "\\begin{cvitems}\n" + "\n".join(bullet_lines) + "\n\\end{cvitems}"
-    return f"""\\cventry
-{{{pos_text}}}
-{{{org_text}}}
-{{{date_text}}}
-{{{loc_text}}}
-{{
-{items_block}
-}}
-"""
-
-
-def render_experience(experience: list[dict]) -> str:
-    """Render the Experience section."""
-    lines = [
-        "%--------------------------------------------------",
-        "% Experience",
-        "%--------------------------------------------------",
-        "\\cvsection{Experience}",
-        "",
-    ]
+    buf: Optional[TextIO] = None,
+) -> Optional[str]:
+    """Render a single cventry (experience or project) from pre-escaped fields (see _escape_data).
+
+    Writes to buf if given, else returns the text.
+    """
+    items_block = "\\begin{cvitems}\n" + "\n".join("\\item " + b for b in bullets) + "\n\\end{cvitems}"
+    entry = _ENTRY_TPL % (position, organization, date, location, items_block)
+    if buf is None:
+        return entry
+    buf.write(entry)
+    return None
+
+
+def render_experience(experience: list[dict], *, buf: Optional[TextIO] = None) -> Optional[str]:
+    """Render the pre-escaped Experience section. Writes to buf if given, else returns the text."""
+    out = io.StringIO() if buf is None else buf
+    out.write(_EXPERIENCE_HEADER)
     for entry in experience:
-        lines.append(
-            render_entry(
-                position=entry["position"],
-                organization=entry.get("organization", ""),
-                date=entry.get("date", ""),
-                location=entry.get("location", ""),
-                bullets=entry.get("bullets", []),
-                raw_position=entry.get("raw_position", False),
-            )
+        out.write("\n")
+        render_entry(
+            position=entry["position"],
+            organization=entry.get("organization", ""),
+            date=entry.get("date", ""),
+            location=entry.get("location", ""),
+            bullets=entry.get("bullets", []),
+            buf=out,
         )
-    return "\n".join(lines)
-
-
-def render_projects(projects: list[dict]) -> str:
-    """Render the Projects section."""
-    lines = [
-        "%--------------------------------------------------",
-        "% Projects",
-        "%--------------------------------------------------",
-        "\\cvsection{Projects}",
-        "",
-    ]
+    return out.getvalue() if buf is None else None
+
+
+def render_projects(projects: list[dict], *, buf: Optional[TextIO] = None) -> Optional[str]:
+    """Render the pre-escaped Projects section. Writes to buf if given, else returns the text."""
+    out = io.StringIO() if buf is None else buf
+    out.write(_PROJECTS_HEADER)
     for entry in projects:
         # LLM may output "name" instead of "position" for projects; accept both.
         position = entry.get("position") or entry.get("name") or ""
@@ -188,17 +319,52 @@ def render_projects(projects: list[dict]) -> str:
             bullets = [d] if isinstance(d, str) else list(d) if isinstance(d, (list, tuple)) else []
         if bullets is None:
             bullets = []
-        lines.append(
-            render_entry(
-                position=position,
-                organization=entry.get("organization", ""),
-                date=entry.get("date", ""),
-                location=entry.get("location", ""),
-                bullets=bullets,
-                raw_position=entry.get("raw_position", False),
-            )
+        out.write("\n")
+        render_entry(
+            position=position,
+            organization=entry.get("organization", ""),
+            date=entry.get("date", ""),
+            location=entry.get("location", ""),
+            bullets=bullets,
+            buf=out,
         )
-    return "\n".join(lines)
+    return out.getvalue() if buf is None else None
+
+
+def _content_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "resume-generator"
+
+
+def load_content(path: Path) -> object:
+    """Load content YAML, reusing a pickled parse from a previous run when the file is unchanged.
+
+    One cache file per content path, validated against the file's mtime and size; cache
+    read/write problems fall back to a normal parse.
+    """
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    cache_file = _content_cache_dir() / (hashlib.blake2b(str(path).encode("utf-8")).hexdigest() + ".pkl")
+    try:
+        with open(cache_file, "rb") as f:
+            cached_stamp, cached_data = pickle.load(f)
+        if cached_stamp == stamp:
+            return cached_data
+    except Exception as e:
+        # Best-effort cache: a stale or foreign file can fail to unpickle in many ways; reparsing is always correct.
+        logging.debug("Could not read content cache %s: %s", cache_file, e)
+
+    with open(path, encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_Loader)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump((stamp, data), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        logging.debug("Could not write content cache %s: %s", cache_file, e)
+    return data
 
 
 def parse_args() -> argparse.Namespace:
@@ -237,6 +403,11 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Use OpenAI API for tailoring (default: Ollama). Requires OPENAI_API_KEY.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached tailoring results (new results are still cached).",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -257,6 +428,27 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+class _ConsoleFormatter(logging.Formatter):
+    """Progress messages as-is; warnings and errors get a "Warning: " prefix."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        return f"Warning: {message}" if record.levelno >= logging.WARNING else message
+
+
+def _configure_tailor_logging(verbose: bool) -> None:
+    """Show tailor's progress (INFO, or DEBUG with --verbose) and warnings on stderr through one handler.
+
+    No propagation, so the root handler basicConfig adds under --verbose doesn't print them twice.
+    """
+    tailor_logger = logging.getLogger("tailor")
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(_ConsoleFormatter("%(message)s"))
+    tailor_logger.addHandler(handler)
+    tailor_logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    tailor_logger.propagate = False
+
+
 def main() -> None:
     args = parse_args()
     if args.verbose:
@@ -279,62 +471,67 @@ def main() -> None:
 
     if tailor_source:
         import tailor as tailor_mod
+        _configure_tailor_logging(args.verbose)
         profile_path = PROFILE_FILE.resolve()
         if profile_path.exists():
-            print("Tailoring resume from user profile + job description via LLM...", flush=True)
-            yaml_str = tailor_mod.tailor_from_profile(
+            print("Tailoring resume from user profile + resume content + job description via LLM...", flush=True)
+            yaml_str = tailor_mod.tailor_combined(
                 profile_path,
+                content_path,
                 tailor_source,
                 use_openai=args.openai,
                 verbose=args.verbose,
                 max_fact_error_rate=args.max_fact_error_rate,
+                no_cache=args.no_cache,
             )
             if yaml_str is not None:
-                data = yaml.safe_load(yaml_str)
+                data = yaml.load(yaml_str, Loader=_Loader)
             else:
                 # Fall back to resume_content.yaml and YAML-based tailoring
                 print("Falling back to resume_content.yaml for tailoring.", flush=True)
-                yaml_str = tailor_mod.tailor(
+                data = tailor_mod.tailor(
                     content_path,
                     tailor_source,
                     use_openai=args.openai,
                     verbose=args.verbose,
                     max_fact_error_rate=args.max_fact_error_rate,
+                    no_cache=args.no_cache,
                 )
-                data = yaml.safe_load(yaml_str)
         else:
             print("Tailoring resume to job description via LLM (Ollama)...", flush=True)
-            yaml_str = tailor_mod.tailor(
+            data = tailor_mod.tailor(
                 content_path,
                 tailor_source,
                 use_openai=args.openai,
                 verbose=args.verbose,
                 max_fact_error_rate=args.max_fact_error_rate,
+                no_cache=args.no_cache,
             )
-            data = yaml.safe_load(yaml_str)
     else:
-        with open(content_path, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = load_content(content_path)
 
     if not data:
         print("Error: Content file is empty.", file=sys.stderr)
         sys.exit(1)
 
-    sections = []
-    if "summary" in data:
-        sections.append(render_summary(data["summary"]))
-    if "skills" in data:
-        sections.append(render_skills(data["skills"]))
-    if "experience" in data:
-        sections.append(render_experience(data["experience"]))
-    if "projects" in data:
-        sections.append(render_projects(data["projects"]))
-
-    output = "\n".join(sections)
+    data = _escape_data(data)
+    renderers = (
+        ("summary", render_summary),
+        ("skills", render_skills),
+        ("experience", render_experience),
+        ("projects", render_projects),
+    )
     out_path = args.output.resolve()
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with open(out_path, "w", encoding="utf-8") as f:
-        f.write(output)
+        first = True
+        for key, render in renderers:
+            if key not in data:
+                continue
+            if not first:
+                f.write("\n")
+            render(data[key], buf=f)
+            first = False
 
     print(f"Generated {out_path}")
 
@@ -15,18 +15,75 @@ the Free Software Foundation, either version 3 of the License, or (at your optio
 any later version. See LICENSE for details.
 """
 
+import codecs
+import gzip
+import hashlib
+import io
+import json
+import mmap
 import os
+import pickle
 import re
-import sys
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, TypedDict
+from typing import Callable, NamedTuple, Optional, TextIO, TypedDict
 
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+# libyaml-backed loader/dumper when PyYAML was built with it; pure-Python otherwise.
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# orjson (optional) decodes/encodes several times faster than json, and loads straight from bytes.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Progress (INFO) and warnings; the application configures where they go (see generate_resume.main).
 logger = logging.getLogger(__name__)
 
+
+def _make_session() -> requests.Session:
+    """Shared HTTP session so repeated Ollama/job-description requests reuse keep-alive connections."""
+    session = requests.Session()
+    # Retries cover connection failures and gateway errors; POSTs are only retried when no request was sent.
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _make_session()
+
+# LaTeX commands (with or without a braced argument) and stray braces in project positions.
+_LATEX_STRIP_RE = re.compile(r"\\[a-z]+\{[^}]*\}|\\[a-z]+|[\{\}]")
+_WS_RE = re.compile(r"\s+")
+# Fenced code block in an LLM response; the language tag is optional.
+_YAML_BLOCK_RE = re.compile(r"```(?:\w+)?\s*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+# Top-level block-style "description:" key (optionally quoted) in a job description YAML file.
+_JD_DESCRIPTION_KEY_RE = re.compile(r"""^["']?description["']?[ \t]*:""", re.MULTILINE)
+# Start of resume YAML in a response (used to pick a code block, or find YAML in unfenced text).
+_YAML_HEAD_RE = re.compile(r"^(summary|skills)\s*:", re.MULTILINE | re.IGNORECASE)
+_SUMMARY_RE = re.compile(r"^summary\s*:", re.MULTILINE | re.IGNORECASE)
+_SKILLS_RE = re.compile(r"^skills\s*:", re.MULTILINE | re.IGNORECASE)
+# Parenthesized URL-like fragments in project positions, e.g. "(desiroomy.app)".
+_PAREN_URL_RE = re.compile(r"\([a-z0-9.-]+\)", re.IGNORECASE)
+# Possible YAML anchor ("&name" after whitespace, "-" or ":"); splicing out its definition would orphan aliases.
+_YAML_ANCHOR_RE = re.compile(r"(?:^|[\s:-])&\S")
+
 SYSTEM_PROMPT = """You are a resume tailor. Your output must contain ONLY information that appears in the user's profile/content below. Do not invent job titles, companies, dates, technologies, projects, or achievements. You may rephrase, reorder, and emphasize to match the job description; you may not add new facts. Output valid YAML only, with keys: summary, skills, experience, projects. Use the same structure as the input (e.g. skills as list of {category, items}, experience/projects as list of {position, organization, date, location, bullets}). Preserve raw_position: true for project entries that need LaTeX in the position field. For skills, keep each category's items string to one line in the PDF (about 50–60 characters); use abbreviations or fewer items per category to avoid wrapping."""
 
 USER_PROMPT_TEMPLATE = """Base resume content (YAML):
@@ -48,6 +105,17 @@ USER_PROMPT_NO_JD_TEMPLATE = """Base resume content (YAML):
 
 Produce a polished version of this resume YAML. Use ONLY the facts above; do not add any new information. Output nothing but the YAML (you may wrap it in a ```yaml ... ``` code block)."""
 
+# OpenAI (large-context) variant of SYSTEM_PROMPT: the model also checks its draft against the BASE_FACTS
+# list appended to the user prompt and fixes offending entries itself, so the separate rewrite call is rarely needed.
+SYSTEM_PROMPT_FUSED = SYSTEM_PROMPT + """ Before answering, check your draft: every experience organization and position, and every project position, must be one listed under BASE_FACTS in the user message. Rewrite any entry that uses a value not listed there so it uses only listed values and facts from the base content, then output only the corrected YAML."""
+
+BASE_FACTS_TEMPLATE = """
+
+# BASE_FACTS (the only organizations, positions, and projects allowed)
+organizations: {organizations}
+positions: {positions}
+projects: {projects}"""
+
 # Profile-based tailoring: user's freeform profile is the single source of truth.
 SYSTEM_PROMPT_PROFILE = """You are a resume generator. Your output must contain ONLY information that appears in the user's profile below. Do not invent job titles, companies, dates, technologies, projects, or achievements. You may rephrase, reorder, and emphasize to match the job description; you may not add new facts. Output valid YAML only, with keys: summary, skills, experience, projects. Use the structure: skills as list of {category, items}; experience and projects as list of {position, organization, date, location, bullets}. Preserve raw_position: true for project entries that need LaTeX in the position field. For skills, keep each category's items string to one line in the PDF (about 50–60 characters); use abbreviations or fewer items per category to avoid wrapping."""
 
@@ -70,6 +138,38 @@ USER_PROMPT_PROFILE_NO_JD_TEMPLATE = """User profile (everything the user has pr
 
 Produce resume YAML from this profile. Use ONLY the facts above; do not add any new information. Output nothing but the YAML (you may wrap it in a ```yaml ... ``` code block)."""
 
+# Combined tailoring: profile and base resume content in one prompt, so a single LLM call covers both sources.
+SYSTEM_PROMPT_COMBINED = """You are a resume generator. Your output must contain ONLY information that appears in the user's profile or base resume content below. Prefer the profile as the source of truth and use the base resume content for structure, wording, and any details the profile lacks. Do not invent job titles, companies, dates, technologies, projects, or achievements. You may rephrase, reorder, and emphasize to match the job description; you may not add new facts. Output valid YAML only, with keys: summary, skills, experience, projects. Use the structure: skills as list of {category, items}; experience and projects as list of {position, organization, date, location, bullets}. Preserve raw_position: true for project entries that need LaTeX in the position field. For skills, keep each category's items string to one line in the PDF (about 50–60 characters); use abbreviations or fewer items per category to avoid wrapping."""
+
+USER_PROMPT_COMBINED_TEMPLATE = """User profile (everything the user has provided about themselves):
+```
+{profile_text}
+```
+
+Base resume content (YAML):
+```yaml
+{base_yaml}
+```
+
+Job description:
+```
+{job_description}
+```
+
+Produce tailored resume YAML that matches the job description while using ONLY the facts from the user profile and base resume content above. Output nothing but the YAML (you may wrap it in a ```yaml ... ``` code block)."""
+
+USER_PROMPT_COMBINED_NO_JD_TEMPLATE = """User profile (everything the user has provided about themselves):
+```
+{profile_text}
+```
+
+Base resume content (YAML):
+```yaml
+{base_yaml}
+```
+
+Produce resume YAML from this profile and base content. Use ONLY the facts above; do not add any new information. Output nothing but the YAML (you may wrap it in a ```yaml ... ``` code block)."""
+
 # Rewrite-only prompt: fix specific experience/project entries that contain facts not in the source.
 SYSTEM_PROMPT_REWRITE = """You are a resume editor. Your task is to rewrite only the given experience or project entries so they use ONLY facts from the source of truth below. Do not add new companies, job titles, or projects. Output valid YAML with keys "experience" and/or "projects" containing only the corrected entries in the same order as given. Preserve raw_position: true for project entries that need LaTeX in the position field."""
 
@@ -85,11 +185,37 @@ Entries to correct (these contain facts not in the source; rewrite them to use o
 
 Output valid YAML with keys "experience" and/or "projects" containing only the corrected entries in the same order. Nothing else."""
 
+# USER_PROMPT_REWRITE_TEMPLATE split at its placeholders once, so each rewrite request is a plain join.
+_REWRITE_HEAD, _rest = USER_PROMPT_REWRITE_TEMPLATE.split("{source}")
+_REWRITE_MID, _REWRITE_TAIL = _rest.split("{entries_yaml}")
+del _rest
+
+
+def _format_rewrite_prompt(source: str, entries_yaml: str) -> str:
+    """Same result as USER_PROMPT_REWRITE_TEMPLATE.format(source=..., entries_yaml=...)."""
+    return "".join((_REWRITE_HEAD, source, _REWRITE_MID, entries_yaml, _REWRITE_TAIL))
+
+
+# USER_PROMPT_TEMPLATE split the same way; the base part is joined once per base text (see _user_prompt_head).
+_PROMPT_PREFIX, _rest = USER_PROMPT_TEMPLATE.split("{base_yaml}")
+_PROMPT_JD_BEFORE, _PROMPT_JD_AFTER = _rest.split("{job_description}")
+del _rest
+
+
+@lru_cache(maxsize=8)
+def _user_prompt_head(base_yaml: str) -> str:
+    """Everything in USER_PROMPT_TEMPLATE before the job description, for one base text."""
+    return "".join((_PROMPT_PREFIX, base_yaml, _PROMPT_JD_BEFORE))
+
+
+def _format_user_prompt(base_yaml: str, job_description: str) -> str:
+    """Same result as USER_PROMPT_TEMPLATE.format(base_yaml=..., job_description=...)."""
+    return "".join((_user_prompt_head(base_yaml), job_description, _PROMPT_JD_AFTER))
+
 
 def load_user_profile(path: Path) -> str:
     """Load user profile text from file. Returns full file content."""
-    with open(path, encoding="utf-8") as f:
-        return f.read()
+    return Path(path).read_text(encoding="utf-8")
 
 
 def _get_ollama_host() -> str:
@@ -100,27 +226,97 @@ def _get_model() -> str:
     return os.environ.get("RESUME_LLM_MODEL", "llama3")
 
 
-def _call_ollama(prompt: str, system: str, verbose: bool = False) -> str:
-    """Call Ollama generate API. Returns full response text."""
+# Output token cap per LLM call (RESUME_LLM_MAX_TOKENS); a full tailored resume is well under this.
+DEFAULT_MAX_OUTPUT_TOKENS = 2048
+# How long Ollama keeps the model loaded after a call, so follow-up/rewrite calls skip the model load.
+OLLAMA_KEEP_ALIVE = "30m"
+
+
+def _get_max_output_tokens() -> int:
+    """Resolve the per-call output token cap from env (default 2048)."""
+    try:
+        return max(1, int(os.environ.get("RESUME_LLM_MAX_TOKENS", DEFAULT_MAX_OUTPUT_TOKENS)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_OUTPUT_TOKENS
+
+
+# Streamed responses are offered to a should_abort callback every this many chunks (about one token each).
+STREAM_CHECK_EVERY = 32
+
+
+class StreamAborted(Exception):
+    """Raised by the LLM callers when should_abort rejects a response part-way through the stream."""
+
+
+class OutputTruncated(Exception):
+    """Raised by the LLM callers when the reply stopped at the output token cap; the YAML may be missing entries."""
+
+    def __init__(self, backend: str):
+        super().__init__(
+            f"{backend} reply hit the {_get_max_output_tokens()}-token output cap (raise RESUME_LLM_MAX_TOKENS)"
+        )
+
+
+def _check_stream(parts: list[str], checked: int, should_abort: Optional[Callable[[str], bool]]) -> int:
+    """Run should_abort on the text so far once STREAM_CHECK_EVERY new chunks arrived. Returns the new checked count."""
+    if should_abort is None or len(parts) - checked < STREAM_CHECK_EVERY:
+        return checked
+    if should_abort("".join(parts)):
+        raise StreamAborted("response rejected while streaming")
+    return len(parts)
+
+
+def _call_ollama(prompt: str, system: str, should_abort: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Call Ollama generate API with streaming. Returns full response text.
+    should_abort, if given, sees the partial text as it streams; returning True closes the stream and raises StreamAborted.
+    """
     host = _get_ollama_host().rstrip("/")
     model = _get_model()
-    print(f"Calling Ollama at {host} (model: {model})...", flush=True, file=sys.stderr)
+    logger.info("Calling Ollama at %s (model: %s)...", host, model)
     url = f"{host}/api/generate"
     # Ollama accepts system prompt in the request
     full_prompt = f"{system}\n\n{prompt}"
-    payload = {"model": model, "prompt": full_prompt, "stream": False}
-    if verbose:
-        logger.info("Calling Ollama at %s with model %s", host, model)
-    resp = requests.post(url, json=payload, timeout=120)
-    if resp.status_code == 404:
-        print(
-            f"Ollama returned 404. The model '{model}' may not be pulled. Try: ollama pull {model}",
-            file=sys.stderr,
-            flush=True,
-        )
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("response", "")
+    payload = {
+        "model": model,
+        "prompt": full_prompt,
+        "stream": True,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "options": {"num_predict": _get_max_output_tokens(), "temperature": 0.3},
+    }
+    if orjson is not None:
+        # Serialize the (large) prompt payload to bytes in C rather than through json.dumps + encode.
+        body = {"data": orjson.dumps(payload), "headers": {"Content-Type": "application/json"}}
+    else:
+        body = {"json": payload}
+    parts: list[str] = []
+    checked = 0
+    # Closed on every path (including HTTP errors) so the pooled connection goes back to _SESSION.
+    with _SESSION.post(url, stream=True, timeout=120, **body) as resp:
+        if resp.status_code == 404:
+            logger.warning("Ollama returned 404. The model '%s' may not be pulled. Try: ollama pull %s", model, model)
+        resp.raise_for_status()
+        # Streamed as newline-delimited JSON chunks, each carrying the next piece of "response".
+        # Collect into a list and join once: `text += chunk` is only linear while CPython can
+        # resize the string in place, and degrades to quadratic copying when it can't.
+        for line in resp.iter_lines():
+            if not line:
+                continue
+            chunk = _json_loads(line)
+            # A failure after the 200 status arrives as an error line; the text so far is incomplete.
+            if "error" in chunk:
+                raise RuntimeError(f"Ollama error: {chunk['error']}")
+            parts.append(chunk.get("response", ""))
+            # The final chunk carries done: true (plus timing stats); stop without waiting for EOF.
+            if chunk.get("done"):
+                if chunk.get("done_reason") == "length":
+                    raise OutputTruncated("Ollama")
+                break
+            checked = _check_stream(parts, checked, should_abort)
+        else:
+            # EOF without a done chunk: the connection dropped or the server stopped mid-reply.
+            raise RuntimeError("Ollama stream ended before the reply was complete")
+    return "".join(parts)
 
 
 def _get_openai_model() -> str:
@@ -128,8 +324,8 @@ def _get_openai_model() -> str:
     return os.environ.get("RESUME_OPENAI_MODEL", "gpt-4o-mini")
 
 
-def _call_openai(prompt: str, system: str, verbose: bool = False) -> str:
-    """Call OpenAI chat API. Returns assistant message content."""
+def _openai_client():
+    """OpenAI client from OPENAI_API_KEY; the openai package is only needed for this backend."""
     try:
         from openai import OpenAI
     except ImportError:
@@ -137,11 +333,17 @@ def _call_openai(prompt: str, system: str, verbose: bool = False) -> str:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY must be set for OpenAI backend")
-    client = OpenAI(api_key=api_key)
+    return OpenAI(api_key=api_key)
+
+
+def _call_openai(prompt: str, system: str, should_abort: Optional[Callable[[str], bool]] = None) -> str:
+    """
+    Call OpenAI chat API with streaming. Returns assistant message content.
+    should_abort works as in _call_ollama.
+    """
+    client = _openai_client()
     model = _get_openai_model()
-    print(f"Calling OpenAI (model: {model})...", flush=True, file=sys.stderr)
-    if verbose:
-        logger.info("Calling OpenAI with model %s", model)
+    logger.info("Calling OpenAI (model: %s)...", model)
     resp = client.chat.completions.create(
         model=model,
         messages=[
@@ -149,137 +351,187 @@ def _call_openai(prompt: str, system: str, verbose: bool = False) -> str:
             {"role": "user", "content": prompt},
         ],
         temperature=0.3,
+        max_tokens=_get_max_output_tokens(),
+        stream=True,
     )
-    return resp.choices[0].message.content or ""
+    parts: list[str] = []
+    checked = 0
+    try:
+        for chunk in resp:
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.delta.content:
+                parts.append(choice.delta.content)
+                checked = _check_stream(parts, checked, should_abort)
+            if choice.finish_reason == "length":
+                raise OutputTruncated("OpenAI")
+    finally:
+        # Closing the stream mid-response stops generation, so an aborted request stops billing tokens.
+        resp.close()
+    return "".join(parts)
 
 
 def _extract_yaml_from_response(text: str) -> str:
     """Extract YAML from markdown code block if present, else return whole text."""
     text = (text or "").strip()
-    # Find all ```...``` blocks; prefer one that looks like resume YAML (has summary: or skills:)
-    blocks = list(re.finditer(r"```(?:\w+)?\s*\n(.*?)```", text, re.DOTALL | re.IGNORECASE))
-    for m in blocks:
-        candidate = m.group(1).strip()
-        if re.search(r"^(summary|skills)\s*:", candidate, re.MULTILINE | re.IGNORECASE):
-            return candidate
-    if blocks:
-        return blocks[0].group(1).strip()
+    # Most responses have no fence at all; only scan for blocks when there is one.
+    if "```" in text:
+        # Find all ```...``` blocks; prefer one that looks like resume YAML (has summary: or skills:)
+        blocks = list(_YAML_BLOCK_RE.finditer(text))
+        for m in blocks:
+            candidate = m.group(1).strip()
+            if _YAML_HEAD_RE.search(candidate):
+                return candidate
+        if blocks:
+            return blocks[0].group(1).strip()
     # No code block: try to find start of YAML (summary: or skills: at line start)
-    for pattern in (r"^summary\s*:", r"^skills\s*:"):
-        m = re.search(pattern, text, re.MULTILINE | re.IGNORECASE)
+    for pattern in (_SUMMARY_RE, _SKILLS_RE):
+        m = pattern.search(text)
         if m:
             return text[m.start() :].strip()
     return text
 
 
+def _skip_space(line: str, i: int) -> int:
+    """Index of the first non-whitespace character in line at or after i."""
+    # Padding here is almost always a single space; only slice and lstrip for longer runs
+    if line[i:i + 1] == " ":
+        i += 1
+    if line[i:i + 1].isspace():
+        rest = line[i:]
+        i += len(rest) - len(rest.lstrip())
+    return i
+
+
+def _split_position_rawpos(line: str) -> Optional[tuple[str, str, str, Optional[str]]]:
+    """
+    Split an LLM 'position: raw_position: "X"' / 'position: raw_position: X' line.
+    Returns (prefix, before, value, suffix): prefix is the leading whitespace, before runs up to
+    'raw_position:'. For a quoted value, value is the text between the quotes and suffix what follows;
+    for an unquoted value, value is the stripped rest of the line and suffix is None. Returns None if neither form matches.
+    """
+    n = len(line)
+    indent = n - len(line.lstrip())
+    unquoted = None
+    k = line.find("position:", indent)
+    while k != -1:
+        # 'position:' must start a word (so 'raw_position:' itself never matches here)
+        if k == 0 or not (line[k - 1].isalnum() or line[k - 1] == "_"):
+            j = _skip_space(line, k + 9)
+            if line.startswith("raw_position:", j):
+                v = j + 13
+                q = _skip_space(line, v)
+                if q < n and line[q] == '"':
+                    end = line.find('"', q + 1)
+                    if end != -1:
+                        return line[:indent], line[indent:j], line[q + 1:end], line[end + 1:]
+                # Unquoted form needs whitespace after the colon and a non-empty value slot
+                if unquoted is None and n - v >= 2 and line[v].isspace():
+                    unquoted = (line[:indent], line[indent:j], line[v:].strip(), None)
+        k = line.find("position:", k + 1)
+    return unquoted
+
+
 def _normalize_llm_yaml(raw: str) -> str:
     """Fix common LLM YAML mistakes before parsing. E.g. 'position: raw_position: X' -> valid."""
     # LLM sometimes outputs invalid 'position: raw_position: "X"' or 'position: raw_position: X' (mapping values not allowed).
     # Normalize to separate keys with correct indentation for list items.
+    if "position: raw_position:" not in raw:
+        return raw
 
-    lines = []
+    lines: list[str] = []
+    append = lines.append
     for line in raw.split("\n"):
-        if "position:" in line and "raw_position:" in line and "position: raw_position:" in line:
+        if "position: raw_position:" in line:
             # Match "position: raw_position: value" or "position: raw_position: "value""
-            quoted = re.match(r"^(\s*)(.*?\bposition:\s*)raw_position:\s*\"([^\"]*)\"(.*)$", line)
-            unquoted = re.match(r"^(\s*)(.*?\bposition:\s*)raw_position:\s+(.+)$", line)
-            if quoted:
-                prefix, before, value, suffix = quoted.group(1, 2, 3, 4)
+            split = _split_position_rawpos(line)
+            if split is not None:
+                prefix, before, value, suffix = split
                 indent = prefix + "  "  # key indent for list item
-                lines.append(f"{prefix}{before}\"{value}\"{suffix}")
-                lines.append(f"{indent}raw_position: true")
-                continue
-            if unquoted:
-                prefix, before, value = unquoted.group(1, 2, 3)
-                value = value.strip()
-                if '"' in value:
-                    value = value.replace("\\", "\\\\").replace('"', '\\"')
-                indent = prefix + "  "
-                lines.append(f'{prefix}{before}"{value}"')
-                lines.append(f"{indent}raw_position: true")
+                if suffix is not None:
+                    append(f"{prefix}{before}\"{value}\"{suffix}")
+                else:
+                    if '"' in value:
+                        value = value.replace("\\", "\\\\").replace('"', '\\"')
+                    append(f'{prefix}{before}"{value}"')
+                append(f"{indent}raw_position: true")
                 continue
-        lines.append(line)
+        append(line)
     return "\n".join(lines)
 
 
-def _parse_tailored_yaml(raw: str) -> Optional[dict]:
-    """Parse tailored YAML string into dict. Returns None on parse error."""
+def _parse_tailored_yaml(raw: str) -> tuple[Optional[dict], Optional[str]]:
+    """Parse tailored YAML string into dict. Returns (data, None), or (None, error message) on parse error."""
     raw = _normalize_llm_yaml(raw)
     try:
-        return yaml.safe_load(raw)
+        return yaml.load(raw, Loader=_Loader), None
     except yaml.YAMLError as e:
         logger.debug("YAML parse error: %s", e)
-        return None
+        return None, str(e)
 
 
+@lru_cache(maxsize=4096)
 def _normalize_for_compare(s: str) -> str:
-    """Normalize string for fuzzy entity comparison."""
-    if not s:
-        return ""
-    return " ".join(s.lower().split())
+    """Normalize string for fuzzy entity comparison: collapse whitespace, casefold."""
+    return _WS_RE.sub(" ", s).strip().casefold() if s else ""
+
+
+@lru_cache(maxsize=4)
+def _normalize_profile_cached(profile_text: str) -> str:
+    """Normalized profile text; validators run on the same profile before and after a rewrite."""
+    return _normalize_for_compare(profile_text)
 
 
+@lru_cache(maxsize=4)
+def _profile_token_index(profile_text: str) -> tuple[frozenset, frozenset]:
+    """Word and adjacent-word-pair sets of the normalized profile, for cheap rejection in _in_profile."""
+    words = _normalize_profile_cached(profile_text).split(" ")
+    return frozenset(words), frozenset(zip(words, words[1:]))
+
+
+@lru_cache(maxsize=4096)
+def _in_profile(norm: str, profile_text: str) -> bool:
+    """True if normalized text occurs (as a substring) in the normalized profile.
+
+    Substring semantics allow the first and last words to match partially, but every inner
+    word and inner word pair must appear whole in the profile; checking those in the token
+    sets rejects most misses without scanning the profile. Memoized: the post-rewrite
+    validation re-checks the same entities against the same profile.
+    """
+    inner = norm.split(" ")[1:-1]
+    if inner:
+        words, pairs = _profile_token_index(profile_text)
+        if not words.issuperset(inner) or not pairs.issuperset(zip(inner, inner[1:])):
+            return False
+    return norm in _normalize_profile_cached(profile_text)
+
+
+@lru_cache(maxsize=4096)
 def _normalize_project_position(pos: str) -> str:
     """Normalize project position for comparison: strip LaTeX, backslashes, URL-like parentheses."""
     if not pos:
         return ""
     # Strip LaTeX commands and braces
-    plain = re.sub(r"\\[a-z]+\{[^}]*\}|\\[a-z]+|[\{\}]", "", pos)
+    plain = _LATEX_STRIP_RE.sub("", pos)
     # Strip any remaining backslashes (e.g. from LLM output)
     plain = plain.replace("\\", "")
     # Remove parenthesized URL-like fragments e.g. (desiroomy.app) so they match "DesiRoomy"
-    plain = re.sub(r"\([a-z0-9.-]+\)", "", plain, flags=re.IGNORECASE)
+    plain = _PAREN_URL_RE.sub("", plain)
     return _normalize_for_compare(plain)
 
 
 def _extract_entities(data: dict) -> dict:
     """Extract companies, positions, project names from resume data for validation."""
-    entities = {"organizations": set(), "positions": set(), "projects": set()}
     if not data:
-        return entities
-    for entry in data.get("experience", []) or []:
-        org = entry.get("organization", "").strip()
-        pos = entry.get("position", "").strip()
-        if org:
-            entities["organizations"].add(_normalize_for_compare(org))
-        if pos:
-            entities["positions"].add(_normalize_for_compare(pos))
-    for entry in data.get("projects", []) or []:
-        pos = entry.get("position", "").strip()
-        if pos:
-            entities["projects"].add(_normalize_project_position(pos))
-    return entities
-
-
-def validate_no_new_facts(base_data: dict, tailored_data: dict) -> tuple[bool, list[str]]:
-    """
-    Check that tailored content does not introduce new companies, job titles, or projects.
-    Returns (is_valid, list of violation messages).
-    """
-    base_entities = _extract_entities(base_data)
-    tailored_entities = _extract_entities(tailored_data)
-    violations = []
-
-    def check_set(name: str, base_set: set, tailored_set: set) -> None:
-        extra = tailored_set - base_set
-        if extra:
-            violations.append(f"Tailored content adds new {name}: {extra}")
-
-    check_set("organizations", base_entities["organizations"], tailored_entities["organizations"])
-    check_set("positions", base_entities["positions"], tailored_entities["positions"])
-    check_set("projects", base_entities["projects"], tailored_entities["projects"])
-
-    # Also require same number of experience and project entries (no new roles)
-    base_exp = (base_data.get("experience") or [])
-    base_proj = (base_data.get("projects") or [])
-    tail_exp = (tailored_data.get("experience") or [])
-    tail_proj = (tailored_data.get("projects") or [])
-    if len(tail_exp) > len(base_exp):
-        violations.append("Tailored content has more experience entries than base.")
-    if len(tail_proj) > len(base_proj):
-        violations.append("Tailored content has more project entries than base.")
-
-    return (len(violations) == 0, violations)
+        return {"organizations": set(), "positions": set(), "projects": set()}
+    exp = data.get("experience") or []
+    proj = data.get("projects") or []
+    # Blank fields are skipped, but a non-blank project position that normalizes to "" (e.g. "(y.app)") still counts.
+    orgs = {_normalize_for_compare(org) for org in (e.get("organization", "").strip() for e in exp) if org}
+    positions = {_normalize_for_compare(pos) for pos in (e.get("position", "").strip() for e in exp) if pos}
+    projects = {_normalize_project_position(pos) for pos in (e.get("position", "").strip() for e in proj) if pos}
+    return {"organizations": orgs, "positions": positions, "projects": projects}
 
 
 class ValidationDetail(TypedDict):
@@ -290,120 +542,205 @@ class ValidationDetail(TypedDict):
     entries_to_rewrite: list  # list of tuple[str, int]: (section, entry_index)
 
 
-def _count_entities(tailored_data: dict) -> int:
-    """Count total entities (org + position in experience, position in projects) in tailored data."""
-    total = 0
-    for entry in (tailored_data.get("experience") or []):
-        if (entry.get("organization") or "").strip():
-            total += 1
-        if (entry.get("position") or "").strip():
-            total += 1
-    for entry in (tailored_data.get("projects") or []):
-        if (entry.get("position") or "").strip():
-            total += 1
-    return total
+class TailoredScan(NamedTuple):
+    entities: dict  # same shape as _extract_entities
+    total_entities: int
+    experience: list  # per entry: (organization, organization_norm, position, position_norm), stripped
+    projects: list  # per entry: (position, position_norm), stripped
+
+
+def _experience_fields(entry: dict) -> tuple[str, str, str, str]:
+    """(organization, organization_norm, position, position_norm) of one experience entry, stripped."""
+    org = (entry.get("organization") or "").strip()
+    pos = (entry.get("position") or "").strip()
+    return org, _normalize_for_compare(org), pos, _normalize_for_compare(pos)
+
+
+def _project_fields(entry: dict) -> tuple[str, str]:
+    """(position, position_norm) of one project entry, stripped."""
+    pos = (entry.get("position") or "").strip()
+    return pos, _normalize_project_position(pos)
+
+
+def _scan_from_fields(exp_fields: list, proj_fields: list) -> TailoredScan:
+    """Build a TailoredScan (entity sets and count) from per-entry fields."""
+    # Same rule as _extract_entities: an entity is present when its raw field is non-blank.
+    orgs = {f[1] for f in exp_fields if f[0]}
+    positions = {f[3] for f in exp_fields if f[2]}
+    projects = {f[1] for f in proj_fields if f[0]}
+    total = sum(bool(f[0]) + bool(f[2]) for f in exp_fields) + sum(bool(f[0]) for f in proj_fields)
+    return TailoredScan(
+        entities={"organizations": orgs, "positions": positions, "projects": projects},
+        total_entities=total,
+        experience=exp_fields,
+        projects=proj_fields,
+    )
 
 
-def validate_no_new_facts_detailed(
-    base_data: dict, tailored_data: dict
+def _scan_tailored(tailored_data: dict) -> TailoredScan:
+    """Walk tailored experience/projects once: entity sets, entity count, and per-entry raw/normalized fields."""
+    if not tailored_data:
+        return _scan_from_fields([], [])
+    return _scan_from_fields(
+        [_experience_fields(entry) for entry in (tailored_data.get("experience") or [])],
+        [_project_fields(entry) for entry in (tailored_data.get("projects") or [])],
+    )
+
+
+def _rescan_entries(scan: TailoredScan, tailored_data: dict, keys: list[tuple[str, int]]) -> TailoredScan:
+    """scan with only the (section, index) entries in keys re-read from tailored_data; other entries are reused."""
+    exp_fields = list(scan.experience)
+    proj_fields = list(scan.projects)
+    for section, idx in keys:
+        if section == "experience":
+            exp_fields[idx] = _experience_fields(tailored_data["experience"][idx])
+        else:
+            proj_fields[idx] = _project_fields(tailored_data["projects"][idx])
+    return _scan_from_fields(exp_fields, proj_fields)
+
+
+# Shared empty result for _new_entities (never mutated).
+_NO_ENTITIES: frozenset = frozenset()
+
+
+def _new_entities(tailored_set: set, base_set: set) -> set:
+    """Entities in tailored_set missing from base_set. The usual no-violation case is a subset check with no new set built."""
+    if tailored_set <= base_set:
+        return _NO_ENTITIES
+    return tailored_set - base_set
+
+
+def _validate_core(
+    base_data: Optional[dict],
+    profile_text: Optional[str],
+    tailored_data: dict,
+    base_entities: Optional[dict] = None,
+    scan: Optional[TailoredScan] = None,
 ) -> ValidationDetail:
     """
-    Like validate_no_new_facts but returns structured data for error rate and entries to rewrite.
+    Shared body of the fact validators: one scan of tailored_data, checked against base_data when given
+    (no new entity sets, no extra entries), else against profile_text (each entity must appear in it).
+    base_entities is an optional precomputed _extract_entities(base_data); scan an optional precomputed _scan_tailored(tailored_data).
     """
-    base_entities = _extract_entities(base_data)
-    tailored_entities = _extract_entities(tailored_data)
+    if scan is None:
+        scan = _scan_tailored(tailored_data)
     violations = []
     entries_to_rewrite_set: set[tuple[str, int]] = set()
+    violating_entities = 0
 
-    new_orgs = tailored_entities["organizations"] - base_entities["organizations"]
-    new_positions = tailored_entities["positions"] - base_entities["positions"]
-    new_projects = tailored_entities["projects"] - base_entities["projects"]
-    if new_orgs:
-        violations.append(f"Tailored content adds new organizations: {new_orgs}")
-    if new_positions:
-        violations.append(f"Tailored content adds new positions: {new_positions}")
-    if new_projects:
-        violations.append(f"Tailored content adds new projects: {new_projects}")
-
-    base_exp = (base_data.get("experience") or [])
-    base_proj = (base_data.get("projects") or [])
-    tail_exp = (tailored_data.get("experience") or [])
-    tail_proj = (tailored_data.get("projects") or [])
-
-    for i, entry in enumerate(tail_exp):
-        org = (entry.get("organization") or "").strip()
-        pos = (entry.get("position") or "").strip()
-        org_norm = _normalize_for_compare(org) if org else ""
-        pos_norm = _normalize_for_compare(pos) if pos else ""
-        if org_norm and org_norm in new_orgs:
-            entries_to_rewrite_set.add(("experience", i))
-        if pos_norm and pos_norm in new_positions:
-            entries_to_rewrite_set.add(("experience", i))
-        if i >= len(base_exp):
-            entries_to_rewrite_set.add(("experience", i))
-    if len(tail_exp) > len(base_exp):
-        violations.append("Tailored content has more experience entries than base.")
-
-    for j, entry in enumerate(tail_proj):
-        pos = (entry.get("position") or "").strip()
-        pos_norm = _normalize_project_position(pos) if pos else ""
-        if pos_norm and pos_norm in new_projects:
-            entries_to_rewrite_set.add(("projects", j))
-        if j >= len(base_proj):
-            entries_to_rewrite_set.add(("projects", j))
-    if len(tail_proj) > len(base_proj):
-        violations.append("Tailored content has more project entries than base.")
-
-    total_entities = _count_entities(tailored_data)
-    violating_entities = len(new_orgs) + len(new_positions) + len(new_projects)
-    if len(tail_exp) > len(base_exp):
-        violating_entities += len(tail_exp) - len(base_exp)
-    if len(tail_proj) > len(base_proj):
-        violating_entities += len(tail_proj) - len(base_proj)
+    if base_data is not None:
+        if base_entities is None:
+            base_entities = _extract_entities(base_data)
+        tailored_entities = scan.entities
+        new_orgs = _new_entities(tailored_entities["organizations"], base_entities["organizations"])
+        new_positions = _new_entities(tailored_entities["positions"], base_entities["positions"])
+        new_projects = _new_entities(tailored_entities["projects"], base_entities["projects"])
+        if new_orgs:
+            violations.append(f"Tailored content adds new organizations: {new_orgs}")
+        if new_positions:
+            violations.append(f"Tailored content adds new positions: {new_positions}")
+        if new_projects:
+            violations.append(f"Tailored content adds new projects: {new_projects}")
+
+        base_exp_count = len(base_data.get("experience") or [])
+        base_proj_count = len(base_data.get("projects") or [])
+        tail_exp = scan.experience
+        tail_proj = scan.projects
+
+        for i, (_, org_norm, _, pos_norm) in enumerate(tail_exp):
+            if org_norm and org_norm in new_orgs:
+                entries_to_rewrite_set.add(("experience", i))
+            if pos_norm and pos_norm in new_positions:
+                entries_to_rewrite_set.add(("experience", i))
+            if i >= base_exp_count:
+                entries_to_rewrite_set.add(("experience", i))
+        if len(tail_exp) > base_exp_count:
+            violations.append("Tailored content has more experience entries than base.")
+
+        for j, (_, pos_norm) in enumerate(tail_proj):
+            if pos_norm and pos_norm in new_projects:
+                entries_to_rewrite_set.add(("projects", j))
+            if j >= base_proj_count:
+                entries_to_rewrite_set.add(("projects", j))
+        if len(tail_proj) > base_proj_count:
+            violations.append("Tailored content has more project entries than base.")
+
+        violating_entities = len(new_orgs) + len(new_positions) + len(new_projects)
+        if len(tail_exp) > base_exp_count:
+            violating_entities += len(tail_exp) - base_exp_count
+        if len(tail_proj) > base_proj_count:
+            violating_entities += len(tail_proj) - base_proj_count
+
+    elif profile_text and tailored_data:
+        for i, (org, org_norm, pos, pos_norm) in enumerate(scan.experience):
+            if org:
+                if not _in_profile(org_norm, profile_text):
+                    violations.append(f"Tailored organization not found in profile: {org!r}")
+                    entries_to_rewrite_set.add(("experience", i))
+                    violating_entities += 1
+            if pos:
+                if not _in_profile(pos_norm, profile_text):
+                    violations.append(f"Tailored position not found in profile: {pos!r}")
+                    entries_to_rewrite_set.add(("experience", i))
+                    violating_entities += 1
+
+        for j, (pos, plain) in enumerate(scan.projects):
+            if pos:
+                if plain and not _in_profile(plain, profile_text):
+                    violations.append(f"Tailored project not found in profile: {pos!r}")
+                    entries_to_rewrite_set.add(("projects", j))
+                    violating_entities += 1
 
     return ValidationDetail(
         is_valid=len(violations) == 0,
         violations=violations,
-        total_entities=total_entities,
+        total_entities=scan.total_entities,
         violating_entities=violating_entities,
         entries_to_rewrite=sorted(entries_to_rewrite_set, key=lambda x: (0 if x[0] == "experience" else 1, x[1])),
     )
 
 
-def validate_tailored_against_profile(profile_text: str, tailored_data: dict) -> tuple[bool, list[str]]:
+def validate_no_new_facts(base_data: dict, tailored_data: dict) -> tuple[bool, list[str]]:
     """
-    Check that tailored YAML does not introduce entities absent from the profile text.
-    Each organization, position, and project in tailored_data must appear (normalized, as substring) in profile_text.
+    Check that tailored content does not introduce new companies, job titles, or projects.
     Returns (is_valid, list of violation messages).
     """
-    if not profile_text or not tailored_data:
-        return (True, [])
-    profile_normalized = _normalize_for_compare(profile_text)
-    violations = []
+    detail = _validate_core(base_data, None, tailored_data)
+    return (detail["is_valid"], detail["violations"])
 
-    def check_in_profile(name: str, value: str, kind: str) -> None:
-        if not value or not value.strip():
-            return
-        norm = _normalize_for_compare(value)
-        if norm not in profile_normalized:
-            violations.append(f"Tailored {kind} not found in profile: {name!r}")
 
-    for entry in (tailored_data.get("experience") or []):
-        org = (entry.get("organization") or "").strip()
-        pos = (entry.get("position") or "").strip()
-        if org:
-            check_in_profile(org, org, "organization")
-        if pos:
-            check_in_profile(pos, pos, "position")
+def validate_no_new_facts_detailed(
+    base_data: dict, tailored_data: dict, base_entities: Optional[dict] = None
+) -> ValidationDetail:
+    """
+    Like validate_no_new_facts but returns structured data for error rate and entries to rewrite.
+    base_entities may be passed in if already extracted from base_data (see _extract_entities).
+    """
+    return _validate_core(base_data, None, tailored_data, base_entities)
 
-    for entry in (tailored_data.get("projects") or []):
-        pos = (entry.get("position") or "").strip()
-        if pos:
-            plain = _normalize_project_position(pos)
-            if plain and plain not in profile_normalized:
-                violations.append(f"Tailored project not found in profile: {pos!r}")
 
-    return (len(violations) == 0, violations)
+def validate_no_new_facts_detailed_subset(
+    base_data: dict,
+    merged_data: dict,
+    rewritten_keys: list[tuple[str, int]],
+    scan: TailoredScan,
+    base_entities: Optional[dict] = None,
+) -> ValidationDetail:
+    """
+    validate_no_new_facts_detailed(base_data, merged_data) after a rewrite, given scan, the _scan_tailored of the
+    data before the rewrite. Only the rewritten_keys entries are re-read from merged_data; the rest are unchanged.
+    """
+    return _validate_core(base_data, None, merged_data, base_entities, _rescan_entries(scan, merged_data, rewritten_keys))
+
+
+def validate_tailored_against_profile(profile_text: str, tailored_data: dict) -> tuple[bool, list[str]]:
+    """
+    Check that tailored YAML does not introduce entities absent from the profile text.
+    Each organization, position, and project in tailored_data must appear (normalized, as substring) in profile_text.
+    Returns (is_valid, list of violation messages).
+    """
+    detail = _validate_core(None, profile_text, tailored_data)
+    return (detail["is_valid"], detail["violations"])
 
 
 def validate_tailored_against_profile_detailed(
@@ -412,88 +749,42 @@ def validate_tailored_against_profile_detailed(
     """
     Like validate_tailored_against_profile but returns structured data for error rate and entries to rewrite.
     """
-    if not profile_text or not tailored_data:
-        return ValidationDetail(
-            is_valid=True,
-            violations=[],
-            total_entities=_count_entities(tailored_data),
-            violating_entities=0,
-            entries_to_rewrite=[],
-        )
-    profile_normalized = _normalize_for_compare(profile_text)
-    violations = []
-    entries_to_rewrite_set: set[tuple[str, int]] = set()
-    violating_entities = 0
+    return _validate_core(None, profile_text, tailored_data)
 
-    for i, entry in enumerate(tailored_data.get("experience") or []):
-        org = (entry.get("organization") or "").strip()
-        pos = (entry.get("position") or "").strip()
-        if org:
-            norm = _normalize_for_compare(org)
-            if norm not in profile_normalized:
-                violations.append(f"Tailored organization not found in profile: {org!r}")
-                entries_to_rewrite_set.add(("experience", i))
-                violating_entities += 1
-        if pos:
-            norm = _normalize_for_compare(pos)
-            if norm not in profile_normalized:
-                violations.append(f"Tailored position not found in profile: {pos!r}")
-                entries_to_rewrite_set.add(("experience", i))
-                violating_entities += 1
-
-    for j, entry in enumerate(tailored_data.get("projects") or []):
-        pos = (entry.get("position") or "").strip()
-        if pos:
-            plain = _normalize_project_position(pos)
-            if plain and plain not in profile_normalized:
-                violations.append(f"Tailored project not found in profile: {pos!r}")
-                entries_to_rewrite_set.add(("projects", j))
-                violating_entities += 1
 
-    total_entities = _count_entities(tailored_data)
-    return ValidationDetail(
-        is_valid=len(violations) == 0,
-        violations=violations,
-        total_entities=total_entities,
-        violating_entities=violating_entities,
-        entries_to_rewrite=sorted(entries_to_rewrite_set, key=lambda x: (0 if x[0] == "experience" else 1, x[1])),
-    )
+# Background work overlapped with LLM calls (e.g. indexing base facts while tailor() waits on the model).
+_BACKGROUND = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tailor-bg")
 
+# Max concurrent per-entry rewrite requests when several entries need fixing.
+REWRITE_MAX_WORKERS = 4
 
-def _rewrite_entries_with_facts(
+
+def _request_rewrite(
     source: str,
-    entries_to_rewrite: list[tuple[str, int]],
-    tailored_data: dict,
+    exp_entries: list,
+    proj_entries: list,
     use_openai: bool,
-    verbose: bool = False,
-) -> Optional[dict]:
-    """
-    Second LLM call: rewrite only the offending experience/project entries to use only facts from source.
-    Returns updated tailored_data with those entries replaced, or None on failure.
-    """
-    if not entries_to_rewrite:
-        return tailored_data
-    exp_entries = [tailored_data["experience"][i] for (sec, i) in entries_to_rewrite if sec == "experience"]
-    proj_entries = [tailored_data["projects"][j] for (sec, j) in entries_to_rewrite if sec == "projects"]
+) -> Optional[tuple[list, list]]:
+    """One rewrite LLM call for the given entries. Returns (corrected experience, corrected projects), or None on failure."""
     entries_block = {}
     if exp_entries:
         entries_block["experience"] = exp_entries
     if proj_entries:
         entries_block["projects"] = proj_entries
-    entries_yaml = yaml.dump(entries_block, default_flow_style=False, allow_unicode=True, sort_keys=False)
-    user_prompt = USER_PROMPT_REWRITE_TEMPLATE.format(source=source, entries_yaml=entries_yaml)
+    entries_yaml = yaml.dump(entries_block, Dumper=_Dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    user_prompt = _format_rewrite_prompt(source, entries_yaml)
     try:
         if use_openai:
-            response_text = _call_openai(user_prompt, SYSTEM_PROMPT_REWRITE, verbose=verbose)
+            response_text = _call_openai(user_prompt, SYSTEM_PROMPT_REWRITE)
         else:
-            response_text = _call_ollama(user_prompt, SYSTEM_PROMPT_REWRITE, verbose=verbose)
+            response_text = _call_ollama(user_prompt, SYSTEM_PROMPT_REWRITE)
     except Exception as e:
         logger.warning("Rewrite LLM call failed: %s", e)
         return None
     raw = _extract_yaml_from_response(response_text)
     raw = _normalize_llm_yaml(raw)
     try:
-        corrected = yaml.safe_load(raw)
+        corrected = yaml.load(raw, Loader=_Loader)
     except yaml.YAMLError as e:
         logger.warning("Rewrite response YAML parse failed: %s", e)
         return None
@@ -506,119 +797,262 @@ def _rewrite_entries_with_facts(
             "Rewrite response entry count mismatch: expected experience=%s projects=%s, got experience=%s projects=%s",
             len(exp_entries), len(proj_entries), len(corrected_exp), len(corrected_proj),
         )
-    # Merge back: replace entries at (section, index) with corrected ones in order
+    return corrected_exp, corrected_proj
+
+
+def _rewrite_entries_with_facts(
+    source: str,
+    entries_to_rewrite: list[tuple[str, int]],
+    tailored_data: dict,
+    use_openai: bool,
+) -> Optional[tuple[dict, list[tuple[str, int]]]]:
+    """
+    Second LLM call: rewrite only the offending experience/project entries to use only facts from source.
+    Several entries are rewritten concurrently, one request per entry (up to REWRITE_MAX_WORKERS at a time).
+    Returns (updated tailored_data with those entries replaced, the (section, index) keys actually replaced),
+    or None on failure.
+    """
+    if not entries_to_rewrite:
+        return tailored_data, []
+    # One request per entry; each returns the corrected entry in its own section's list.
+    call_args = [
+        (
+            source,
+            [tailored_data[section][idx]] if section == "experience" else [],
+            [tailored_data[section][idx]] if section == "projects" else [],
+            use_openai,
+        )
+        for section, idx in entries_to_rewrite
+    ]
+    if len(call_args) == 1:
+        results = [_request_rewrite(*call_args[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(REWRITE_MAX_WORKERS, len(call_args))) as executor:
+            results = list(executor.map(lambda args: _request_rewrite(*args), call_args))
+    if None in results:
+        return None
+    # Merge back in the same pass: replace entries at (section, index) with corrected ones
     result = dict(tailored_data)
     result["experience"] = list((result.get("experience") or []))
     result["projects"] = list((result.get("projects") or []))
-    exp_i = 0
-    proj_j = 0
-    for section, idx in entries_to_rewrite:
-        if section == "experience":
-            if exp_i < len(corrected_exp):
-                result["experience"][idx] = corrected_exp[exp_i]
-            exp_i += 1
+    rewritten = []
+    for (section, idx), (corrected_exp, corrected_proj) in zip(entries_to_rewrite, results):
+        new_entries = corrected_exp if section == "experience" else corrected_proj
+        if new_entries:
+            result[section][idx] = new_entries[0]
+            rewritten.append((section, idx))
+    return result, rewritten
+
+
+def _splice_entries(yaml_text: str, data: dict, keys: list[tuple[str, int]]) -> Optional[str]:
+    """
+    yaml_text (which parses to data, apart from the entries at keys) with only those (section, index) entries re-dumped.
+    Each entry's lines are located from the composed node marks and replaced in place, so the rest of the document is
+    copied rather than re-emitted. Returns None when the layout isn't plain block style; callers then dump data whole.
+    """
+    try:
+        root = yaml.compose(yaml_text, Loader=_Loader)
+    except yaml.YAMLError:
+        return None
+    if not isinstance(root, yaml.MappingNode):
+        return None
+    pairs = root.value
+    spans = []
+    for section, idx in set(keys):
+        # The last occurrence of a duplicated key is the one that was loaded.
+        for n in range(len(pairs) - 1, -1, -1):
+            key_node, seq = pairs[n]
+            if isinstance(key_node, yaml.ScalarNode) and key_node.value == section:
+                break
         else:
-            if proj_j < len(corrected_proj):
-                result["projects"][idx] = corrected_proj[proj_j]
-            proj_j += 1
-    return result
+            return None
+        if not isinstance(seq, yaml.SequenceNode) or seq.flow_style or idx >= len(seq.value):
+            return None
+        node = seq.value[idx]
+        if not isinstance(node, yaml.MappingNode) or node.flow_style:
+            return None
+        # Replace whole lines: from the entry's "- " line up to the next entry's (or the next top-level key's).
+        start = yaml_text.rfind("\n", 0, node.start_mark.index) + 1
+        if yaml_text[start:node.start_mark.index].strip() != "-":
+            return None
+        if idx + 1 < len(seq.value):
+            next_index = seq.value[idx + 1].start_mark.index
+            end = yaml_text.rfind("\n", 0, next_index) + 1
+            if yaml_text[end:next_index].strip() != "-":
+                return None
+        elif n + 1 < len(pairs):
+            end = yaml_text.rfind("\n", 0, pairs[n + 1][0].start_mark.index) + 1
+        else:
+            end = len(yaml_text)
+        if _YAML_ANCHOR_RE.search(yaml_text, start, end):
+            return None
+        spans.append((start, end, node.start_mark.index - start, data[section][idx]))
+    spans.sort(key=lambda span: span[0])
+    out = []
+    pos = 0
+    for start, end, column, entry in spans:
+        fragment = yaml.dump(entry, Dumper=_Dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        out.append(yaml_text[pos:start])
+        out.append(yaml_text[start:start + column])
+        out.append(fragment.rstrip("\n").replace("\n", "\n" + " " * column))
+        out.append("\n")
+        pos = end
+    out.append(yaml_text[pos:])
+    return "".join(out)
+
+
+def _format_base_facts(base_data: dict) -> str:
+    """BASE_FACTS block for the fused prompt: base entity values as written (deduplicated, in order)."""
+    exp = base_data.get("experience") or []
+    proj = base_data.get("projects") or []
+
+    def listed(values) -> str:
+        return "; ".join(dict.fromkeys(v for v in values if v)) or "(none)"
+
+    return BASE_FACTS_TEMPLATE.format(
+        organizations=listed((e.get("organization") or "").strip() for e in exp),
+        positions=listed((e.get("position") or "").strip() for e in exp),
+        projects=listed((e.get("position") or "").strip() for e in proj),
+    )
+
+
+# Fallback share of new facts tolerated in tailored content (RESUME_TAILOR_MAX_FACT_ERROR_RATE)
+DEFAULT_MAX_FACT_ERROR_RATE = 0.2
+
+
+def _read_max_fact_error_rate_env() -> float:
+    try:
+        rate = float(os.environ.get("RESUME_TAILOR_MAX_FACT_ERROR_RATE", DEFAULT_MAX_FACT_ERROR_RATE))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_FACT_ERROR_RATE
+    return max(0.0, min(1.0, rate))
+
+
+# The env default is resolved once at import; only an explicit argument is parsed per call.
+_MAX_FACT_ERROR_RATE = _read_max_fact_error_rate_env()
 
 
 def _get_max_fact_error_rate(max_fact_error_rate: Optional[float]) -> float:
-    """Resolve max fact error rate from env or argument (default 0.20)."""
-    if max_fact_error_rate is not None:
-        return max(0.0, min(1.0, float(max_fact_error_rate)))
+    """Resolve max fact error rate from argument, else RESUME_TAILOR_MAX_FACT_ERROR_RATE as read at import (default 0.20)."""
+    if max_fact_error_rate is None:
+        return _MAX_FACT_ERROR_RATE
+    return max(0.0, min(1.0, float(max_fact_error_rate)))
+
+
+# Default cap on bytes read from a job description URL (RESUME_TAILOR_MAX_JD_BYTES)
+DEFAULT_MAX_JD_BYTES = 256 * 1024
+
+
+def _get_max_jd_bytes() -> int:
+    """Resolve max job description download size from env (default 256 KB)."""
     try:
-        return max(0.0, min(1.0, float(os.environ.get("RESUME_TAILOR_MAX_FACT_ERROR_RATE", "0.2"))))
+        return max(1, int(os.environ.get("RESUME_TAILOR_MAX_JD_BYTES", DEFAULT_MAX_JD_BYTES)))
     except (TypeError, ValueError):
-        return 0.2
+        return DEFAULT_MAX_JD_BYTES
 
 
 def fetch_job_description(url: str, verbose: bool = False) -> str:
-    """Fetch job description text from URL. Returns raw text (no parsing)."""
+    """Fetch job description text from URL. Returns raw text (no parsing), truncated to RESUME_TAILOR_MAX_JD_BYTES."""
+    buf = io.StringIO()
+    _fetch_job_description_into(url, buf, verbose=verbose)
+    return buf.getvalue()
+
+
+def _fetch_job_description_into(url: str, buf: TextIO, verbose: bool = False) -> None:
+    """
+    fetch_job_description, but decodes the page chunk by chunk straight into buf.
+    _tailor_prompts passes the half-built user prompt, so the JD text is never held as a separate string.
+    """
     if verbose:
         logger.info("Fetching job description from %s", url)
-    resp = requests.get(url, timeout=30)
-    resp.raise_for_status()
-    return resp.text
+    max_bytes = _get_max_jd_bytes()
+    with _SESSION.get(url, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        decoder = codecs.getincrementaldecoder(resp.encoding or "utf-8")(errors="replace")
+        remaining = max_bytes
+        for chunk in resp.iter_content(8192):
+            buf.write(decoder.decode(chunk[:remaining]))
+            remaining -= len(chunk)
+            if remaining <= 0:
+                if verbose:
+                    logger.info("Job description truncated to %d bytes", max_bytes)
+                break
+        buf.write(decoder.decode(b"", final=True))
+
+
+def _json_dumps(obj) -> str:
+    """Compact JSON text for obj; YAML dates and other non-JSON scalars fall back to str()."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
 
 
 def load_job_description_from_file(path: Path) -> str:
     """Load job description from file. If YAML with 'description' key, use that; else full file text."""
-    with open(path, encoding="utf-8") as f:
-        content = f.read()
+    content = Path(path).read_text(encoding="utf-8")
+    # Plain-text postings never have a top-level description key; skip the YAML parser for them.
+    if not (_JD_DESCRIPTION_KEY_RE.search(content) or content.lstrip().startswith("{")):
+        return content
     try:
-        data = yaml.safe_load(content)
+        data = yaml.load(content, Loader=_Loader)
         if isinstance(data, dict) and "description" in data:
             desc = data["description"]
-            return desc if isinstance(desc, str) else yaml.dump(desc, default_flow_style=False)
+            # The description is opaque prompt text; compact JSON is cheaper than YAML and uses fewer tokens.
+            return desc if isinstance(desc, str) else _json_dumps(desc)
     except yaml.YAMLError:
         pass
     return content
 
 
-def tailor_from_profile(
-    profile_path: Path,
-    job_description_source: Optional[str] = None,
-    *,
-    use_openai: bool = False,
-    verbose: bool = False,
-    max_fact_error_rate: Optional[float] = None,
-) -> Optional[str]:
-    """
-    Produce tailored resume YAML from user profile text and optional job description.
-    Profile is the single source of truth; the LLM may only use facts from the profile.
+def _is_url(job_description_source: str) -> bool:
+    jd_source = job_description_source.strip()
+    return jd_source.startswith("http://") or jd_source.startswith("https://")
 
-    When the LLM introduces facts not in the profile, if the error rate is within
-    max_fact_error_rate (default from RESUME_TAILOR_MAX_FACT_ERROR_RATE, e.g. 0.2),
-    the tailored content is accepted with a warning. If over the threshold, a second
-    LLM call rewrites only the offending entries; if that fails, returns None.
 
-    Returns YAML string on success, or None on LLM/parse/validation failure (caller should fall back).
-    """
-    profile_text = load_user_profile(profile_path)
-    if not profile_text.strip():
-        logger.warning("User profile is empty.")
-        return None
+def _load_job_description(job_description_source: str, verbose: bool = False) -> str:
+    """Load job description text from a URL (http:// or https://) or a file path."""
+    jd_source = job_description_source.strip()
+    if _is_url(jd_source):
+        return fetch_job_description(jd_source, verbose=verbose)
+    return load_job_description_from_file(Path(jd_source))
 
-    if job_description_source:
-        jd_source = job_description_source.strip()
-        if jd_source.startswith("http://") or jd_source.startswith("https://"):
-            job_description = fetch_job_description(jd_source, verbose=verbose)
-        else:
-            job_description = load_job_description_from_file(Path(jd_source))
-        user_prompt = USER_PROMPT_PROFILE_TEMPLATE.format(
-            profile_text=profile_text, job_description=job_description
-        )
-    else:
-        user_prompt = USER_PROMPT_PROFILE_NO_JD_TEMPLATE.format(profile_text=profile_text)
 
+def _run_tailoring(
+    source_text: str,
+    user_prompt: str,
+    system_prompt: str,
+    *,
+    label: str,
+    use_openai: bool,
+    verbose: bool,
+    max_fact_error_rate: Optional[float],
+) -> Optional[str]:
+    """
+    Run one tailoring prompt and check the result against freeform source text (profile, or profile + content).
+    label names the mode in messages (e.g. "profile"). Returns YAML string, or None on LLM/parse/validation failure.
+    """
     try:
         if use_openai:
-            response_text = _call_openai(user_prompt, SYSTEM_PROMPT_PROFILE, verbose=verbose)
+            response_text = _call_openai(user_prompt, system_prompt)
         else:
-            response_text = _call_ollama(user_prompt, SYSTEM_PROMPT_PROFILE, verbose=verbose)
+            response_text = _call_ollama(user_prompt, system_prompt)
     except Exception as e:
-        print(f"Warning: LLM call failed ({e}); profile tailoring aborted.", file=sys.stderr, flush=True)
-        logger.warning("LLM call failed (%s); profile tailoring aborted.", e)
+        logger.warning("LLM call failed (%s); %s tailoring aborted.", e, label)
         return None
 
     raw_yaml = _extract_yaml_from_response(response_text)
-    tailored_data = _parse_tailored_yaml(raw_yaml)
+    tailored_data, parse_error = _parse_tailored_yaml(raw_yaml)
     if tailored_data is None:
-        print("Warning: Could not parse LLM output as YAML; profile tailoring aborted.", file=sys.stderr, flush=True)
-        logger.warning("Could not parse LLM output as YAML; profile tailoring aborted.")
+        logger.warning("Could not parse LLM output as YAML; %s tailoring aborted.", label)
         if verbose:
-            try:
-                yaml.safe_load(raw_yaml)
-            except yaml.YAMLError as e:
-                print(f"YAML error: {e}", file=sys.stderr, flush=True)
+            if parse_error:
+                logger.info("YAML error: %s", parse_error)
             preview = response_text[:1200] + ("..." if len(response_text) > 1200 else "")
-            print(f"LLM response (first 1200 chars):\n{preview}", file=sys.stderr, flush=True)
-            print(f"Extracted YAML (first 800 chars):\n{raw_yaml[:800]}{'...' if len(raw_yaml) > 800 else ''}", file=sys.stderr, flush=True)
+            logger.info("LLM response (first 1200 chars):\n%s", preview)
+            logger.info("Extracted YAML (first 800 chars):\n%s%s", raw_yaml[:800], "..." if len(raw_yaml) > 800 else "")
         return None
 
-    detail = validate_tailored_against_profile_detailed(profile_text, tailored_data)
+    detail = validate_tailored_against_profile_detailed(source_text, tailored_data)
     total_entities = detail["total_entities"]
     violating_entities = detail["violating_entities"]
     error_rate = (violating_entities / total_entities) if total_entities else 0.0
@@ -626,54 +1060,432 @@ def tailor_from_profile(
 
     if error_rate <= threshold:
         if error_rate > 0:
-            print(
-                f"Warning: Tailored content has {violating_entities}/{total_entities} introduced facts ({error_rate:.0%}); within tolerance ({threshold:.0%}), accepting.",
-                file=sys.stderr,
-                flush=True,
-            )
             logger.warning(
-                "Tailored content has %s/%s introduced facts (within tolerance); accepting.",
-                violating_entities, total_entities,
+                "Tailored content has %s/%s introduced facts (%.0f%%); within tolerance (%.0f%%), accepting.",
+                violating_entities, total_entities, error_rate * 100, threshold * 100,
             )
-        print("Using tailored content from LLM (profile-based).", file=sys.stderr, flush=True)
-        return yaml.dump(tailored_data, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        logger.info("Using tailored content from LLM (%s-based).", label)
+        # The (normalized) text that parsed to tailored_data is already valid YAML for it; skip the re-dump.
+        # _normalize_llm_yaml returns its input unchanged unless a raw_position fix-up is needed.
+        return _normalize_llm_yaml(raw_yaml)
 
     # Over threshold: rewrite only the offending entries
-    print(
-        f"Tailored content has {violating_entities}/{total_entities} introduced facts ({error_rate:.0%}); over tolerance ({threshold:.0%}). Rewriting offending entries...",
-        file=sys.stderr,
-        flush=True,
+    logger.info(
+        "Tailored content has %s/%s introduced facts (%.0f%%); over tolerance (%.0f%%). Rewriting offending entries...",
+        violating_entities, total_entities, error_rate * 100, threshold * 100,
     )
-    merged = _rewrite_entries_with_facts(
-        profile_text,
+    rewrite = _rewrite_entries_with_facts(
+        source_text,
         detail["entries_to_rewrite"],
         tailored_data,
         use_openai,
-        verbose=verbose,
     )
-    if merged is None:
-        print("Warning: Rewrite failed; profile tailoring aborted.", file=sys.stderr, flush=True)
-        logger.warning("Rewrite failed; profile tailoring aborted.")
+    if rewrite is None:
+        logger.warning("Rewrite failed; %s tailoring aborted.", label)
         return None
-    detail2 = validate_tailored_against_profile_detailed(profile_text, merged)
+    merged, rewritten_keys = rewrite
+    detail2 = validate_tailored_against_profile_detailed(source_text, merged)
     total2 = detail2["total_entities"]
     err2 = (detail2["violating_entities"] / total2) if total2 else 0.0
     if err2 > threshold:
-        print(
-            f"Warning: After rewrite, fact error rate still {err2:.0%}; profile tailoring aborted.",
-            file=sys.stderr,
-            flush=True,
-        )
-        logger.warning("After rewrite, fact error rate still over threshold; aborting.")
+        logger.warning("After rewrite, fact error rate still %.0f%%; %s tailoring aborted.", err2 * 100, label)
         return None
     if detail2["violating_entities"] > 0:
-        print(
-            f"Warning: After rewrite, {detail2['violating_entities']}/{total2} introduced facts remain; within tolerance, accepting.",
-            file=sys.stderr,
-            flush=True,
+        logger.warning(
+            "After rewrite, %s/%s introduced facts remain; within tolerance, accepting.",
+            detail2["violating_entities"], total2,
         )
-    print("Using tailored content from LLM (profile-based, after rewrite).", file=sys.stderr, flush=True)
-    return yaml.dump(merged, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    logger.info("Using tailored content from LLM (%s-based, after rewrite).", label)
+    # Only the rewritten entries changed; splice them into the LLM's own text rather than re-dumping everything.
+    spliced = _splice_entries(_normalize_llm_yaml(raw_yaml), merged, rewritten_keys)
+    if spliced is not None:
+        return spliced
+    return yaml.dump(merged, Dumper=_Dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
+
+
+def _tailor_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "resume-tailor"
+
+
+def _tailor_cache_enabled() -> bool:
+    return os.environ.get("RESUME_TAILOR_CACHE", "1").strip().lower() not in ("0", "false", "no", "")
+
+
+def _semantic_cache_enabled() -> bool:
+    return os.environ.get("RESUME_TAILOR_SEMANTIC_CACHE", "").strip().lower() in ("1", "true", "yes")
+
+
+# Cosine similarity at or above which a cached job description counts as the same posting.
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+
+@lru_cache(maxsize=1)
+def _jd_embedder():
+    """sentence-transformers model for fuzzy job description matching, or None if not installed."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.warning("RESUME_TAILOR_SEMANTIC_CACHE requires: pip install sentence-transformers")
+        return None
+    return SentenceTransformer("all-MiniLM-L6-v2")
+
+
+def _embed_jd(job_description: str) -> Optional[list[float]]:
+    model = _jd_embedder()
+    if model is None:
+        return None
+    return [float(x) for x in model.encode(job_description, normalize_embeddings=True)]
+
+
+def _tailor_cache_load(source_key: str, job_description: str) -> Optional[str]:
+    """Cached tailored YAML for this source and job description: exact hit first, then semantic hit if enabled."""
+    cache_dir = _tailor_cache_dir()
+    key = hashlib.sha256(f"{source_key}\x00{job_description}".encode("utf-8")).hexdigest()
+    path = cache_dir / f"{key}.yaml.gz"
+    if not path.exists() and _semantic_cache_enabled() and job_description:
+        path = None
+        embedding = _embed_jd(job_description)
+        try:
+            with open(cache_dir / f"{source_key}.semantic.json", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = []
+        if embedding is not None:
+            best_score = SEMANTIC_CACHE_THRESHOLD
+            for item in index:
+                score = sum(a * b for a, b in zip(embedding, item["embedding"]))
+                if score >= best_score:
+                    best_score, path = score, cache_dir / f"{item['key']}.yaml.gz"
+        if path is None:
+            return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _tailor_cache_store(source_key: str, job_description: str, yaml_str: str) -> None:
+    """Write tailored YAML to the cache (gzip), and record the JD embedding when semantic caching is on."""
+    cache_dir = _tailor_cache_dir()
+    key = hashlib.sha256(f"{source_key}\x00{job_description}".encode("utf-8")).hexdigest()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_dir / f"{key}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(yaml_str)
+        os.replace(tmp, cache_dir / f"{key}.yaml.gz")
+        if _semantic_cache_enabled() and job_description:
+            embedding = _embed_jd(job_description)
+            if embedding is None:
+                return
+            index_path = cache_dir / f"{source_key}.semantic.json"
+            try:
+                with open(index_path, encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = []
+            index = [item for item in index if item["key"] != key]
+            index.append({"key": key, "embedding": embedding})
+            tmp = cache_dir / f"{source_key}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp, index_path)
+    except OSError as e:
+        logger.debug("Could not write tailor cache: %s", e)
+
+
+def _llm_cache_path(user_prompt: str, system_prompt: str, use_openai: bool, threshold: float) -> Optional[Path]:
+    """
+    Cache file for an accepted LLM reply, keyed on backend, model, output cap, fact threshold, and both prompts;
+    None when RESUME_TAILOR_CACHE=0. The threshold is part of the key so a reply is only replayed where it passed.
+    """
+    if not _tailor_cache_enabled():
+        return None
+    backend = "openai" if use_openai else "ollama"
+    model = _get_openai_model() if use_openai else _get_model()
+    key = hashlib.blake2b(
+        f"{backend}|{model}|{_get_max_output_tokens()}|{threshold!r}|{system_prompt}|{user_prompt}".encode("utf-8")
+    ).hexdigest()
+    return _tailor_cache_dir() / "responses" / f"{key}.txt.gz"
+
+
+def _llm_cache_load(path: Path) -> Optional[str]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, EOFError):
+        return None
+    logger.info("Using cached LLM response.")
+    return text
+
+
+def _llm_cache_store(path: Path, text: str) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-thread temp name: tailor_batch may write the same key from several workers.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.debug("Could not write LLM response cache: %s", e)
+
+
+def _cached_result_within_tolerance(source_text: str, yaml_str: str, max_fact_error_rate: Optional[float]) -> bool:
+    """True if cached tailored YAML still parses and passes the fact check against source_text at the current threshold."""
+    try:
+        data = yaml.load(yaml_str, Loader=_Loader)
+    except yaml.YAMLError:
+        return False
+    if not isinstance(data, dict):
+        return False
+    detail = validate_tailored_against_profile_detailed(source_text, data)
+    total = detail["total_entities"]
+    error_rate = (detail["violating_entities"] / total) if total else 0.0
+    return error_rate <= _get_max_fact_error_rate(max_fact_error_rate)
+
+
+def _tailor_against_source(
+    source_text: str,
+    user_prompt: str,
+    system_prompt: str,
+    *,
+    job_description: str,
+    label: str,
+    use_openai: bool,
+    verbose: bool,
+    max_fact_error_rate: Optional[float],
+    no_cache: bool = False,
+) -> Optional[str]:
+    """
+    Like _run_tailoring, but reuses a cached result for the same source, model and job description,
+    after re-checking it against source_text at this call's max_fact_error_rate.
+    Set RESUME_TAILOR_CACHE=0 to disable; RESUME_TAILOR_SEMANTIC_CACHE=1 also matches near-identical JDs.
+    no_cache skips the lookup but still stores a new result.
+    """
+    if not _tailor_cache_enabled():
+        return _run_tailoring(
+            source_text, user_prompt, system_prompt, label=label,
+            use_openai=use_openai, verbose=verbose, max_fact_error_rate=max_fact_error_rate,
+        )
+    model = f"openai:{_get_openai_model()}" if use_openai else f"ollama:{_get_model()}"
+    source_key = hashlib.sha256("\x00".join((label, model, system_prompt, source_text)).encode("utf-8")).hexdigest()
+    cached = None if no_cache else _tailor_cache_load(source_key, job_description)
+    if cached is not None:
+        # The entry may have been accepted under a looser threshold (or matched a different JD semantically).
+        if _cached_result_within_tolerance(source_text, cached, max_fact_error_rate):
+            logger.info("Using cached tailored content (%s-based).", label)
+            return cached
+        logger.info("Cached tailored content (%s-based) is over the fact error tolerance; regenerating.", label)
+    yaml_str = _run_tailoring(
+        source_text, user_prompt, system_prompt, label=label,
+        use_openai=use_openai, verbose=verbose, max_fact_error_rate=max_fact_error_rate,
+    )
+    if yaml_str is not None:
+        _tailor_cache_store(source_key, job_description, yaml_str)
+    return yaml_str
+
+
+def tailor_from_profile(
+    profile_path: Path,
+    job_description_source: Optional[str] = None,
+    *,
+    use_openai: bool = False,
+    verbose: bool = False,
+    max_fact_error_rate: Optional[float] = None,
+    no_cache: bool = False,
+) -> Optional[str]:
+    """
+    Produce tailored resume YAML from user profile text and optional job description.
+    Profile is the single source of truth; the LLM may only use facts from the profile.
+
+    When the LLM introduces facts not in the profile, if the error rate is within
+    max_fact_error_rate (default from RESUME_TAILOR_MAX_FACT_ERROR_RATE, e.g. 0.2),
+    the tailored content is accepted with a warning. If over the threshold, a second
+    LLM call rewrites only the offending entries; if that fails, returns None.
+    Results are cached (see _tailor_against_source); no_cache=True always calls the LLM.
+
+    Returns YAML string on success, or None on LLM/parse/validation failure (caller should fall back).
+    """
+    profile_text = load_user_profile(profile_path)
+    if not profile_text.strip():
+        logger.warning("User profile is empty.")
+        return None
+
+    if job_description_source:
+        job_description = _load_job_description(job_description_source, verbose=verbose)
+        user_prompt = USER_PROMPT_PROFILE_TEMPLATE.format(
+            profile_text=profile_text, job_description=job_description
+        )
+    else:
+        job_description = ""
+        user_prompt = USER_PROMPT_PROFILE_NO_JD_TEMPLATE.format(profile_text=profile_text)
+
+    return _tailor_against_source(
+        profile_text,
+        user_prompt,
+        SYSTEM_PROMPT_PROFILE,
+        job_description=job_description,
+        label="profile",
+        use_openai=use_openai,
+        verbose=verbose,
+        max_fact_error_rate=max_fact_error_rate,
+        no_cache=no_cache,
+    )
+
+
+def tailor_combined(
+    profile_path: Path,
+    base_content_path: Path,
+    job_description_source: Optional[str] = None,
+    *,
+    use_openai: bool = False,
+    verbose: bool = False,
+    max_fact_error_rate: Optional[float] = None,
+    no_cache: bool = False,
+) -> Optional[str]:
+    """
+    Produce tailored resume YAML from user profile and base content in a single LLM call.
+    The LLM prefers profile facts and may also use base content; output is validated against both.
+
+    Same fact error-rate handling and caching as tailor_from_profile. Returns YAML string on success,
+    or None on empty profile or LLM/parse/validation failure (caller should fall back to tailor()).
+    """
+    profile_text = load_user_profile(profile_path)
+    if not profile_text.strip():
+        logger.warning("User profile is empty.")
+        return None
+    base_yaml_str, _ = _load_base_content(base_content_path)
+
+    if job_description_source:
+        job_description = _load_job_description(job_description_source, verbose=verbose)
+        user_prompt = USER_PROMPT_COMBINED_TEMPLATE.format(
+            profile_text=profile_text, base_yaml=base_yaml_str, job_description=job_description
+        )
+    else:
+        job_description = ""
+        user_prompt = USER_PROMPT_COMBINED_NO_JD_TEMPLATE.format(
+            profile_text=profile_text, base_yaml=base_yaml_str
+        )
+
+    return _tailor_against_source(
+        f"{profile_text}\n\n{base_yaml_str}",
+        user_prompt,
+        SYSTEM_PROMPT_COMBINED,
+        job_description=job_description,
+        label="profile+content",
+        use_openai=use_openai,
+        verbose=verbose,
+        max_fact_error_rate=max_fact_error_rate,
+        no_cache=no_cache,
+    )
+
+
+# Files above this size are parsed from an mmap; below it, mmap setup costs more than it saves.
+MMAP_MIN_BYTES = 64 * 1024
+
+
+@lru_cache(maxsize=32)
+def _load_base(path: str, mtime_ns: int, size: int) -> tuple[str, bytes]:
+    """
+    Read and parse base content YAML once per (path, mtime, size).
+    Returns (raw text, pickled parsed data); the pickle lets every caller get its own copy cheaply.
+    """
+    if size <= MMAP_MIN_BYTES:
+        # Parse the bytes themselves: libyaml reads UTF-8 input directly, no str round-trip for the parser.
+        with open(path, "rb") as f:
+            raw = f.read()
+        text = raw.decode("utf-8")
+        data = yaml.load(raw, Loader=_Loader)
+    else:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = yaml.load(mm, Loader=_Loader)
+            text = mm[:].decode("utf-8")
+    return text, pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+
+def _load_base_content(path: Path) -> tuple[str, object]:
+    """Read base content YAML. Returns (raw text, parsed data); repeat calls for an unchanged file skip the parse."""
+    st = os.stat(path)
+    text, blob = _load_base(os.fspath(path), st.st_mtime_ns, st.st_size)
+    # Unpickle a fresh copy: tailor() hands base_data back to callers, who may mutate it.
+    return text, pickle.loads(blob)
+
+
+# Validation results remembered per (base content, raw LLM YAML); identical outputs skip re-validation.
+VALIDATION_MEMO_SIZE = 64
+_validation_memo: dict[tuple[bytes, bytes], tuple[ValidationDetail, TailoredScan]] = {}
+_validation_memo_lock = threading.Lock()
+
+
+def _validate_against_base_memo(
+    base_key: bytes, raw_yaml: str, base_data: dict, tailored_data: dict, base_entities_future
+) -> tuple[ValidationDetail, TailoredScan]:
+    """
+    validate_no_new_facts_detailed(base_data, tailored_data) plus the tailored scan it used, memoized on base_key
+    (digest of the base text) and a digest of raw_yaml, the LLM text tailored_data was parsed from.
+    The returned values are shared; don't mutate them.
+    """
+    key = (base_key, hashlib.blake2b(raw_yaml.encode("utf-8"), digest_size=16).digest())
+    with _validation_memo_lock:
+        cached = _validation_memo.get(key)
+    if cached is not None:
+        return cached
+    scan = _scan_tailored(tailored_data)
+    result = _validate_core(base_data, None, tailored_data, base_entities_future.result(), scan), scan
+    with _validation_memo_lock:
+        _validation_memo[key] = result
+        while len(_validation_memo) > VALIDATION_MEMO_SIZE:
+            del _validation_memo[next(iter(_validation_memo))]
+    return result
+
+
+# Early abort (RESUME_TAILOR_EARLY_ABORT=1): a streamed tailoring response is dropped once its completed
+# entries show a fact error rate above this multiple of the threshold, over at least this many entities.
+EARLY_ABORT_FACTOR = 2.0
+EARLY_ABORT_MIN_ENTITIES = 4
+
+
+def _early_abort_enabled() -> bool:
+    return os.environ.get("RESUME_TAILOR_EARLY_ABORT", "").strip().lower() in ("1", "true", "yes")
+
+
+def _completed_entries(text: str) -> Optional[dict]:
+    """
+    Parse the finished part of a streaming tailoring response, or None if it does not parse yet.
+    The trailing partial line is cut, and the last experience/project entry is dropped while its section is still open.
+    """
+    raw = _extract_yaml_from_response(text)
+    raw = raw[: raw.rfind("\n") + 1]
+    data, _ = _parse_tailored_yaml(raw)
+    if not isinstance(data, dict) or not data:
+        return None
+    last_key = next(reversed(data))
+    if last_key in ("experience", "projects") and isinstance(data[last_key], list):
+        data[last_key] = data[last_key][:-1]
+    for section in ("experience", "projects"):
+        entries = data.get(section)
+        if entries is not None and not (isinstance(entries, list) and all(isinstance(e, dict) for e in entries)):
+            return None
+    return data
+
+
+def _early_abort_check(base_data: dict, base_entities_future, threshold: float) -> Callable[[str], bool]:
+    """should_abort callback for tailor(): True once completed entries are clearly over the fact threshold."""
+
+    def should_abort(text: str) -> bool:
+        partial = _completed_entries(text)
+        if partial is None:
+            return False
+        detail = validate_no_new_facts_detailed(base_data, partial, base_entities_future.result())
+        total = detail["total_entities"]
+        if total < EARLY_ABORT_MIN_ENTITIES:
+            return False
+        return detail["violating_entities"] / total > threshold * EARLY_ABORT_FACTOR
+
+    return should_abort
 
 
 def tailor(
@@ -683,9 +1495,10 @@ def tailor(
     use_openai: bool = False,
     verbose: bool = False,
     max_fact_error_rate: Optional[float] = None,
-) -> str:
+    no_cache: bool = False,
+) -> dict:
     """
-    Produce tailored resume YAML from base content and optional job description.
+    Produce tailored resume content from base content and optional job description.
 
     job_description_source: path to a file, or URL (must start with http:// or https://).
     If None, only polish the base content (no JD).
@@ -693,100 +1506,320 @@ def tailor(
     When the LLM introduces facts not in the base, if the error rate is within
     max_fact_error_rate, the tailored content is accepted with a warning. If over
     the threshold, a second LLM call rewrites only the offending entries; if that
-    fails, returns base content YAML.
+    fails, returns base content.
+
+    Accepted LLM responses are cached on disk per prompt, model and threshold (see RESUME_TAILOR_CACHE);
+    no_cache=True always calls the LLM (and refreshes the cached response).
 
-    Returns YAML string. On LLM/parse/validation failure, returns base content YAML and logs warning.
+    Returns the parsed content dict, ready to render (see tailor_as_yaml_string for YAML text).
+    On LLM/parse/validation failure, returns base content and logs warning.
     """
-    with open(base_content_path, encoding="utf-8") as f:
-        base_yaml_str = f.read()
-    base_data = yaml.safe_load(base_yaml_str)
+    base_yaml_str, base_data = _load_base_content(base_content_path)
     if not base_data:
         logger.warning("Base content is empty; returning as-is.")
-        return base_yaml_str
+        return base_data
+    return _tailor_one(
+        base_data,
+        base_yaml_str,
+        job_description_source,
+        use_openai=use_openai,
+        verbose=verbose,
+        max_fact_error_rate=max_fact_error_rate,
+        no_cache=no_cache,
+    )
 
-    if job_description_source:
-        jd_source = job_description_source.strip()
-        if jd_source.startswith("http://") or jd_source.startswith("https://"):
-            job_description = fetch_job_description(jd_source, verbose=verbose)
-        else:
-            job_description = load_job_description_from_file(Path(jd_source))
-        user_prompt = USER_PROMPT_TEMPLATE.format(
-            base_yaml=base_yaml_str, job_description=job_description
+
+class _RateLimiter:
+    """Spaces calls to acquire() at least 60 / requests_per_minute seconds apart, across threads."""
+
+    def __init__(self, requests_per_minute: float):
+        self._interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self._interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+# Seconds between status checks of an OpenAI Batch API job (tailor_batch(batch_mode=True)).
+BATCH_POLL_SECONDS = 30
+_BATCH_FINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
+
+def _openai_batch_responses(prompts: list[tuple[str, str]], verbose: bool = False) -> Optional[list[Optional[str]]]:
+    """
+    Run (user prompt, system prompt) pairs through the OpenAI Batch API: half the cost and no per-request rate
+    limits, but results can take up to the 24h completion window. Returns the response texts in order (None for
+    individual requests that failed), or None if the batch itself could not be run.
+    """
+    try:
+        client = _openai_client()
+        model = _get_openai_model()
+        lines = [
+            _json_dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": model,
+                    "messages": [{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+                    "temperature": 0.3,
+                    "max_tokens": _get_max_output_tokens(),
+                },
+            })
+            for i, (prompt, system) in enumerate(prompts)
+        ]
+        upload = client.files.create(file=("tailor_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+        batch = client.batches.create(input_file_id=upload.id, endpoint="/v1/chat/completions", completion_window="24h")
+        logger.info(
+            "Submitted OpenAI batch %s (%s requests, model: %s); checking every %ss...",
+            batch.id, len(prompts), model, BATCH_POLL_SECONDS,
         )
+        while batch.status not in _BATCH_FINAL_STATUSES:
+            time.sleep(BATCH_POLL_SECONDS)
+            batch = client.batches.retrieve(batch.id)
+            if verbose:
+                logger.info("OpenAI batch %s: %s", batch.id, batch.status)
+        if batch.status != "completed" or not batch.output_file_id:
+            raise RuntimeError(f"batch {batch.id} ended with status {batch.status}")
+        output = client.files.content(batch.output_file_id).text
+    except Exception as e:
+        logger.warning("OpenAI batch failed (%s); sending requests individually.", e)
+        return None
+
+    responses: list[Optional[str]] = [None] * len(prompts)
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        item = _json_loads(line)
+        response = item.get("response") or {}
+        if response.get("status_code") != 200:
+            continue
+        try:
+            choice = response["body"]["choices"][0]
+            # Truncated at the output cap: leave it as failed, like a request that errored.
+            if choice.get("finish_reason") == "length":
+                continue
+            responses[int(item["custom_id"])] = choice["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+    return responses
+
+
+def tailor_batch(
+    base_content_path: Path,
+    job_description_sources: list[Optional[str]],
+    *,
+    max_concurrency: int = 8,
+    requests_per_minute: Optional[float] = None,
+    use_openai: bool = False,
+    batch_mode: bool = False,
+    verbose: bool = False,
+    max_fact_error_rate: Optional[float] = None,
+    no_cache: bool = False,
+) -> list[dict]:
+    """
+    Tailor one base content file against several job descriptions (paths or URLs) concurrently.
+
+    The base file is read and parsed once. Up to max_concurrency jobs run at a time; requests_per_minute,
+    if given, spaces out job starts to stay under the provider's rate limit (rewrite calls are not counted).
+    With use_openai and batch_mode, the tailoring requests go through the OpenAI Batch API instead (cheaper,
+    but may take hours); jobs whose batch request failed, or all of them if the batch fails, are sent individually.
+    no_cache is passed through to each job as in tailor().
+    Returns one content dict per source, in order, with the same fallbacks as tailor(); a job that raises
+    (e.g. its job description file is missing) gets base content, and the other jobs' results are kept.
+    """
+    st = os.stat(base_content_path)
+    base_yaml_str, blob = _load_base(os.fspath(base_content_path), st.st_mtime_ns, st.st_size)
+    # Each job unpickles its own copy: results (including base-content fallbacks) go back to the caller.
+    if not pickle.loads(blob):
+        logger.warning("Base content is empty; returning as-is.")
+        return [pickle.loads(blob) for _ in job_description_sources]
+    limiter = _RateLimiter(requests_per_minute) if requests_per_minute else None
+
+    def job_failed(jd_source: Optional[str], e: Exception) -> dict:
+        logger.warning("Tailoring for %s failed (%s); using base content.", jd_source, e)
+        return pickle.loads(blob)
+
+    def run(jd_source: Optional[str], response_text: Optional[str] = None, error: Optional[Exception] = None) -> dict:
+        if error is not None:
+            return job_failed(jd_source, error)
+        if response_text is None and limiter is not None:
+            limiter.acquire()
+        try:
+            return _tailor_one(
+                pickle.loads(blob),
+                base_yaml_str,
+                jd_source,
+                use_openai=use_openai,
+                verbose=verbose,
+                max_fact_error_rate=max_fact_error_rate,
+                response_text=response_text,
+                no_cache=no_cache,
+            )
+        except Exception as e:
+            return job_failed(jd_source, e)
+
+    count = len(job_description_sources)
+    responses: list[Optional[str]] = [None] * count
+    errors: list[Optional[Exception]] = [None] * count
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, count or 1))) as executor:
+        if use_openai and batch_mode and job_description_sources:
+            base_data = pickle.loads(blob)
+
+            def prompts_for(jd_source: Optional[str]):
+                try:
+                    return _tailor_prompts(base_data, base_yaml_str, jd_source, use_openai, verbose)
+                except Exception as e:
+                    return e
+
+            prompts = list(executor.map(prompts_for, job_description_sources))
+            ok = [i for i, p in enumerate(prompts) if not isinstance(p, Exception)]
+            for i, p in enumerate(prompts):
+                if isinstance(p, Exception):
+                    errors[i] = p
+            batch = _openai_batch_responses([prompts[i] for i in ok], verbose=verbose) if ok else None
+            if batch is not None:
+                for i, response_text in zip(ok, batch):
+                    responses[i] = response_text
+        return list(executor.map(run, job_description_sources, responses, errors))
+
+
+def _tailor_prompts(
+    base_data: dict, base_yaml_str: str, job_description_source: Optional[str], use_openai: bool, verbose: bool
+) -> tuple[str, str]:
+    """(user prompt, system prompt) for YAML-based tailoring; loads the job description if one is given."""
+    # One self-checking call for OpenAI; the rewrite in _tailor_one then only runs if the model still slipped.
+    facts = _format_base_facts(base_data) if use_openai else ""
+    system_prompt = SYSTEM_PROMPT_FUSED if use_openai else SYSTEM_PROMPT
+    if job_description_source and _is_url(job_description_source):
+        # Fetched pages can be large: stream them into the prompt buffer rather than copying the text in afterwards.
+        buf = io.StringIO()
+        buf.write(_user_prompt_head(base_yaml_str))
+        _fetch_job_description_into(job_description_source.strip(), buf, verbose=verbose)
+        buf.write(_PROMPT_JD_AFTER)
+        buf.write(facts)
+        return buf.getvalue(), system_prompt
+    if job_description_source:
+        job_description = _load_job_description(job_description_source, verbose=verbose)
+        user_prompt = _format_user_prompt(base_yaml_str, job_description)
     else:
-        job_description = "(none)"
         user_prompt = USER_PROMPT_NO_JD_TEMPLATE.format(base_yaml=base_yaml_str)
+    return user_prompt + facts, system_prompt
+
 
+def _tailor_one(
+    base_data: dict,
+    base_yaml_str: str,
+    job_description_source: Optional[str],
+    *,
+    use_openai: bool,
+    verbose: bool,
+    max_fact_error_rate: Optional[float],
+    response_text: Optional[str] = None,
+    no_cache: bool = False,
+) -> dict:
+    """
+    Body of tailor() for already-loaded, non-empty base content; base_data is returned on fallback.
+    response_text, if given, is an LLM reply already fetched for this job (see tailor_batch), and no call is made.
+    Replies accepted without a rewrite are cached on disk (see _llm_cache_path); no_cache skips the lookup
+    but still stores a newly accepted reply.
+    """
+    threshold = _get_max_fact_error_rate(max_fact_error_rate)
+    cache_path = None
+    if response_text is None:
+        user_prompt, system_prompt = _tailor_prompts(base_data, base_yaml_str, job_description_source, use_openai, verbose)
+        cache_path = _llm_cache_path(user_prompt, system_prompt, use_openai, threshold)
+        if cache_path is not None and not no_cache:
+            response_text = _llm_cache_load(cache_path)
+            if response_text is not None:
+                cache_path = None  # already stored
+    # Index base facts while the LLM call is in flight; validation below only needs the result.
+    base_entities_future = _BACKGROUND.submit(_extract_entities, base_data)
+    should_abort = _early_abort_check(base_data, base_entities_future, threshold) if _early_abort_enabled() else None
     try:
-        if use_openai:
-            response_text = _call_openai(user_prompt, SYSTEM_PROMPT, verbose=verbose)
-        else:
-            response_text = _call_ollama(user_prompt, SYSTEM_PROMPT, verbose=verbose)
+        if response_text is None:
+            call_llm = _call_openai if use_openai else _call_ollama
+            response_text = call_llm(user_prompt, system_prompt, should_abort=should_abort)
+    except StreamAborted:
+        logger.warning("Tailored content was introducing too many new facts; stopped early, using base content.")
+        return base_data
     except Exception as e:
-        print(f"Warning: LLM call failed ({e}); using base content.", file=sys.stderr, flush=True)
         logger.warning("LLM call failed (%s); using base content.", e)
-        return base_yaml_str
+        return base_data
 
     raw_yaml = _extract_yaml_from_response(response_text)
-    tailored_data = _parse_tailored_yaml(raw_yaml)
+    tailored_data, _ = _parse_tailored_yaml(raw_yaml)
     if tailored_data is None:
-        print("Warning: Could not parse LLM output as YAML; using base content.", file=sys.stderr, flush=True)
         logger.warning("Could not parse LLM output as YAML; using base content.")
-        return base_yaml_str
-
-    detail = validate_no_new_facts_detailed(base_data, tailored_data)
+        return base_data
+    # Conservative models often echo the base back; nothing in it can be a new fact.
+    if tailored_data == base_data:
+        logger.info("LLM returned the base content unchanged; using it as-is.")
+        if cache_path is not None:
+            _llm_cache_store(cache_path, response_text)
+        return base_data
+
+    base_key = hashlib.blake2b(base_yaml_str.encode("utf-8"), digest_size=16).digest()
+    detail, scan = _validate_against_base_memo(base_key, raw_yaml, base_data, tailored_data, base_entities_future)
     total_entities = detail["total_entities"]
     violating_entities = detail["violating_entities"]
     error_rate = (violating_entities / total_entities) if total_entities else 0.0
-    threshold = _get_max_fact_error_rate(max_fact_error_rate)
 
     if error_rate <= threshold:
         if error_rate > 0:
-            print(
-                f"Warning: Tailored content has {violating_entities}/{total_entities} new facts ({error_rate:.0%}); within tolerance ({threshold:.0%}), accepting.",
-                file=sys.stderr,
-                flush=True,
-            )
             logger.warning(
-                "Tailored content has %s/%s new facts (within tolerance); accepting.",
-                violating_entities, total_entities,
+                "Tailored content has %s/%s new facts (%.0f%%); within tolerance (%.0f%%), accepting.",
+                violating_entities, total_entities, error_rate * 100, threshold * 100,
             )
-        print("Using tailored content from LLM.", file=sys.stderr, flush=True)
-        return yaml.dump(tailored_data, default_flow_style=False, allow_unicode=True, sort_keys=False)
+        logger.info("Using tailored content from LLM.")
+        if cache_path is not None:
+            _llm_cache_store(cache_path, response_text)
+        return tailored_data
 
     # Over threshold: rewrite only the offending entries
-    print(
-        f"Tailored content has {violating_entities}/{total_entities} new facts ({error_rate:.0%}); over tolerance ({threshold:.0%}). Rewriting offending entries...",
-        file=sys.stderr,
-        flush=True,
+    logger.info(
+        "Tailored content has %s/%s new facts (%.0f%%); over tolerance (%.0f%%). Rewriting offending entries...",
+        violating_entities, total_entities, error_rate * 100, threshold * 100,
     )
-    merged = _rewrite_entries_with_facts(
+    rewrite = _rewrite_entries_with_facts(
         base_yaml_str,
         detail["entries_to_rewrite"],
         tailored_data,
         use_openai,
-        verbose=verbose,
     )
-    if merged is None:
-        print("Warning: Rewrite failed; using base content.", file=sys.stderr, flush=True)
+    if rewrite is None:
         logger.warning("Rewrite failed; using base content.")
-        return base_yaml_str
-    detail2 = validate_no_new_facts_detailed(base_data, merged)
+        return base_data
+    merged, rewritten_keys = rewrite
+    # Only the rewritten entries changed; re-read just those on top of the first validation's scan.
+    detail2 = validate_no_new_facts_detailed_subset(
+        base_data, merged, rewritten_keys, scan, base_entities_future.result()
+    )
     total2 = detail2["total_entities"]
     err2 = (detail2["violating_entities"] / total2) if total2 else 0.0
     if err2 > threshold:
-        print(
-            f"Warning: After rewrite, fact error rate still {err2:.0%}; using base content.",
-            file=sys.stderr,
-            flush=True,
-        )
-        logger.warning("After rewrite, fact error rate still over threshold; using base content.")
-        return base_yaml_str
+        logger.warning("After rewrite, fact error rate still %.0f%%; using base content.", err2 * 100)
+        return base_data
     if detail2["violating_entities"] > 0:
-        print(
-            f"Warning: After rewrite, {detail2['violating_entities']}/{total2} new facts remain; within tolerance, accepting.",
-            file=sys.stderr,
-            flush=True,
+        logger.warning(
+            "After rewrite, %s/%s new facts remain; within tolerance, accepting.",
+            detail2["violating_entities"], total2,
         )
-    print("Using tailored content from LLM (after rewrite).", file=sys.stderr, flush=True)
-    return yaml.dump(merged, default_flow_style=False, allow_unicode=True, sort_keys=False)
+    logger.info("Using tailored content from LLM (after rewrite).")
+    return merged
+
+
+def tailor_as_yaml_string(
+    base_content_path: Path,
+    job_description_source: Optional[str] = None,
+    **kwargs,
+) -> str:
+    """Like tailor(), but returns the tailored content serialized as a YAML string."""
+    data = tailor(base_content_path, job_description_source, **kwargs)
+    return yaml.dump(data, Dumper=_Dumper, default_flow_style=False, allow_unicode=True, sort_keys=False)
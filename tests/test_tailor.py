@@ -0,0 +1,69 @@
+"""Tests for tailor.py. Run from the repo root: python -m unittest"""
+
+import json
+import unittest
+from unittest import mock
+
+import tailor
+
+
+class _FakeStream:
+    """Stands in for a streamed requests.Response carrying Ollama's NDJSON chunks."""
+
+    status_code = 200
+
+    def __init__(self, chunks: list[dict]):
+        self._lines = [json.dumps(chunk).encode("utf-8") for chunk in chunks]
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.closed = True
+        return False
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def iter_lines(self):
+        return iter(self._lines)
+
+
+class CallOllamaStreamTests(unittest.TestCase):
+    def _call(self, chunks: list[dict]):
+        stream = _FakeStream(chunks)
+        with mock.patch.object(tailor._SESSION, "post", return_value=stream):
+            try:
+                return tailor._call_ollama("prompt", "system")
+            finally:
+                self.assertTrue(stream.closed)
+
+    def test_complete_stream_returns_text(self):
+        text = self._call([
+            {"response": "summary: x\n", "done": False},
+            {"response": "", "done": True, "done_reason": "stop"},
+        ])
+        self.assertEqual(text, "summary: x\n")
+
+    def test_stream_without_done_raises(self):
+        with self.assertRaises(RuntimeError):
+            self._call([{"response": "summary: x\nexperience:\n", "done": False}])
+
+    def test_stream_with_error_line_raises(self):
+        with self.assertRaises(RuntimeError):
+            self._call([
+                {"response": "summary: x\nexperience:\n- position: A\n", "done": False},
+                {"error": "model runner has unexpectedly stopped"},
+            ])
+
+    def test_stream_stopped_at_token_cap_raises(self):
+        with self.assertRaises(tailor.OutputTruncated):
+            self._call([
+                {"response": "summary: x\n", "done": False},
+                {"response": "", "done": True, "done_reason": "length"},
+            ])
+
+
+if __name__ == "__main__":
+    unittest.main()